@@ -0,0 +1,60 @@
+# anchor_scan.py
+# Batched two-point anchor search for the HP balance fits.
+# Every anchor pair (i, j) fixes the line y = a + b t through (t_i, y_i) and
+# (t_j, y_j); all pairs are scored at once from centered moments of (t, y), so
+# the cost is O(n_i * n_j) with no per-pair pass over the data.
+
+import numpy as np
+
+def anchor_scan(t, y, i_min=4, i_max=14, j_min=22, j_max=36, min_gap=3, masses=None):
+    """
+    Score every anchor pair i_min <= i <= i_max, max(i + min_gap, j_min) <= j <= j_max.
+
+    Returns a dict with index vectors I, J, the (n_i, n_j) surfaces a, b, R2,
+    rmse (NaN where the pair is not allowed), and `best`: the pair maximizing
+    (R2, -rmse), the same choice and dict keys as sweep_anchors.
+    masses=(mp, mq, p, q) adds delta/gamma surfaces and best-pair values from
+    two_point_delta_gamma.
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    i_max = min(i_max, n - 1)
+    j_max = min(j_max, n - 1)
+    I = np.arange(i_min, i_max + 1)
+    J = np.arange(j_min, j_max + 1)
+    ok = J[None, :] >= np.maximum(I[:, None] + min_gap, j_min)
+
+    Ii, Jj = np.broadcast_arrays(I[:, None], J[None, :])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        b = np.where(ok, (y[Jj] - y[Ii]) / (t[Jj] - t[Ii]), np.nan)
+    a = y[Ii] - b*t[Ii]
+
+    # SS_res of y - a - b t via centered moments: yc - c - b tc, c = a + b tbar - ybar
+    tbar, ybar = t.mean(), y.mean()
+    tc, yc = t - tbar, y - ybar
+    Stt, Sty, Syy = tc @ tc, tc @ yc, yc @ yc
+    c = a + b*tbar - ybar
+    ss_res = np.maximum(Syy - 2*b*Sty + b**2*Stt + n*c**2, 0.0)
+    R2 = 1 - ss_res/Syy if Syy > 0 else np.full_like(b, np.nan)
+    rmse = np.sqrt(ss_res/n)
+
+    out = dict(I=I, J=J, a=a, b=b, R2=R2, rmse=rmse, best=None)
+    if np.any(ok & np.isfinite(R2)):
+        r2 = np.where(ok, R2, -np.inf)
+        cand = r2 == r2.max()
+        flat = np.argmin(np.where(cand, rmse, np.inf))          # row-major: first in loop order
+        bi, bj = np.unravel_index(flat, r2.shape)
+        out['best'] = dict(i=int(I[bi]), j=int(J[bj]), a=a[bi, bj], b=b[bi, bj],
+                           R2=R2[bi, bj], rmse=float(rmse[bi, bj]))
+
+    if masses is not None:
+        mp, mq, p, q = masses
+        fp, fq = a + b*t[p], a + b*t[q]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gamma = (mq - mp) / (fq - fp)
+        delta = mp - gamma*fp
+        out['delta'], out['gamma'] = delta, gamma
+        if out['best'] is not None:
+            out['best'].update(delta=float(delta[bi, bj]), gamma=float(gamma[bi, bj]))
+    return out
@@ -0,0 +1,247 @@
+# chi_vortex_fft.py
+# Fourier-space fast path for the chi-vortex operator
+#     L = -Chi^{-1} Dk Chi Dk (+ Chi^{-1} U),   Dk = D1 + i*kappa,
+# on the periodic tau grid shared by equation_test*.py, chi_vortex_static*.py
+# and overlay_map_Reimann*.py.
+#
+# D1 (central difference) is circulant, so Dk is diagonal in Fourier space with
+# symbol i*w_q, w_q = sin(q*dt)/dt + kappa. Pointwise functions of tau (chi, U)
+# become circulant convolutions of their Fourier coefficients: exactly banded
+# (cyclically) when chi is 1 + c1 cos + c2 cos 2 + c3 cos 3.
+#   - apply_operator: the archive's Hermitized L applied in O(M log M) via FFT
+#   - sparse_operator: the same Hermitized L as a cyclically banded sparse matrix
+#   - operator_spectrum: uniform chi -> closed form w_q^2, exact;
+#                        harmonic chi -> eigenvalues of sparse_operator (dense
+#                        eigvalsh up to DENSE_MAX, shift-invert eigsh beyond)
+#   - fourier_pencil: A v = lam B v for the un-Hermitized L. It equals the
+#     archive operator only for uniform chi (relative error ~5e-4 at c3=0.01,
+#     ~4e-3 at c3=0.03), so nothing that is scored against build_operator uses it.
+
+import numpy as np
+
+DENSE_MAX = 512              # operators up to this size go to dense eigvalsh (hp_bench: sparse wins beyond)
+
+# ——— GRID AND DIFFERENCE OPERATOR ———
+def tau_grid(M):
+    tau = np.linspace(0, 2*np.pi, M, endpoint=False)
+    return tau, tau[1] - tau[0]
+
+def periodic_D1(M, dt):
+    """Dense circulant central difference (same matrix as the old loop builders)."""
+    D1 = np.zeros((M, M), dtype=complex)
+    i = np.arange(M)
+    D1[i, (i+1) % M] =  0.5/dt
+    D1[i, (i-1) % M] = -0.5/dt
+    return D1
+
+def dk_symbol(M, theta):
+    """Real w_q with Dk = F^-1 diag(i*w_q) F, q = 0..M-1 (numpy FFT order)."""
+    _, dt = tau_grid(M)
+    return np.sin(2*np.pi*np.arange(M)/M)/dt + theta/(2*np.pi)
+
+def harmonic_chi(M, c1=0.0, c2=0.0, c3=0.0):
+    tau, _ = tau_grid(M)
+    chi = 1.0 + c1*np.cos(tau) + c2*np.cos(2*tau) + c3*np.cos(3*tau)
+    return np.maximum(chi, 1e-6)
+
+# ——— MATRIX-FREE APPLY ———
+def apply_operator(x, M, theta=np.pi, chi=None, U=None):
+    """
+    (L + L^H)/2 @ x for the dense archive operator, without forming it:
+    two FFT pairs per Dk Chi Dk product. x is (M,) or (M, n).
+    """
+    w = dk_symbol(M, theta).reshape((M,) + (1,)*(np.ndim(x) - 1))
+    chi = np.ones(M) if chi is None else np.asarray(chi, dtype=float)
+    chi = chi.reshape(w.shape)
+    Dk = lambda y: np.fft.ifft(1j*w*np.fft.fft(y, axis=0), axis=0)
+    x = np.asarray(x, dtype=complex)
+    # L x = -chi^-1 Dk chi Dk x ;  L^H x = -Dk chi Dk (x / chi)
+    y = -0.5*(Dk(chi*Dk(x))/chi + Dk(chi*Dk(x/chi)))
+    if U is not None:
+        U = np.asarray(U, dtype=float).reshape(w.shape)
+        y += U*x/chi                      # diag(U/chi) is already Hermitian
+    return y
+
+def operator(M, theta=np.pi, c1=0.0, c2=0.0, c3=0.0, U=None):
+    """scipy LinearOperator wrapping apply_operator for eigsh/lobpcg."""
+    from scipy.sparse.linalg import LinearOperator
+    chi = harmonic_chi(M, c1, c2, c3)
+    mv = lambda x: apply_operator(x, M, theta, chi, U)
+    return LinearOperator((M, M), matvec=mv, matmat=mv, rmatvec=mv, rmatmat=mv, dtype=complex)
+
+def sparse_operator(M, theta=np.pi, chi=None, U=None):
+    """
+    (L + L^H)/2 as a sparse csr matrix, equal to the archive build_operator
+    (plus Chi^-1 U when U is given). Nonzeros sit within two cyclic
+    diagonals of the main one.
+    """
+    from scipy.sparse import diags, identity
+    _, dt = tau_grid(M)
+    chi = np.ones(M) if chi is None else np.asarray(chi, dtype=float)
+    D1 = diags([0.5/dt, -0.5/dt, -0.5/dt, 0.5/dt], [1, -1, M - 1, -(M - 1)],
+               shape=(M, M), format='csr', dtype=complex)
+    Dk = D1 + 1j*theta/(2*np.pi)*identity(M, dtype=complex, format='csr')
+    L = -diags(1/chi) @ Dk @ diags(chi) @ Dk
+    L = 0.5*(L + L.conj().T)
+    if U is not None:
+        L = L + diags(np.asarray(U, dtype=float)/chi)
+    return L.tocsr()
+
+def hermitian_spectrum(H, k=200):
+    """
+    Lowest k positive eigenvalues (ascending) of a Hermitian H, dense or
+    sparse: dense eigvalsh up to DENSE_MAX (or when k is a large fraction
+    of M), shift-invert eigsh below the Gershgorin bound beyond.
+    """
+    M = H.shape[0]
+    if M <= DENSE_MAX or k >= M // 4:
+        lam = np.linalg.eigvalsh(H.toarray() if hasattr(H, 'toarray') else H)
+    else:
+        from scipy.sparse.linalg import eigsh
+        d = H.diagonal().real
+        radius = np.asarray(abs(H).sum(axis=1)).ravel() - np.abs(d)
+        sigma = (d - radius).min() - 1.0          # left of the whole spectrum
+        lam = np.sort(eigsh(H.tocsc(), k=min(M - 2, k + 8), sigma=sigma, which='LM',
+                            return_eigenvectors=False).real)
+    lam = lam[lam > 1e-12]
+    return lam[:k]
+
+# ——— FOURIER PENCIL ———
+def _circulant_coeffs(f, tol=1e-14):
+    """Fourier coefficients fhat (f = sum fhat_m e^{i m tau}) keyed by cyclic shift m."""
+    fh = np.fft.fft(f)/len(f)
+    keep = np.nonzero(np.abs(fh) > tol*max(np.abs(fh).max(), 1.0))[0]
+    return {int(m): fh[m] for m in keep}
+
+def fourier_pencil(M, theta=np.pi, chi=None, U=None):
+    """
+    Sparse Hermitian (A, B) with A = Dk^H Chi Dk + U and B = Chi in the
+    unitary Fourier basis: L v = lam v  <=>  A v = lam B v. For harmonic chi
+    both are cyclically banded with half-width = highest harmonic.
+    """
+    from scipy.sparse import diags
+    w = dk_symbol(M, theta)
+    chi = np.ones(M) if chi is None else np.asarray(chi, dtype=float)
+
+    def circulant(coeffs):
+        offs, data = [], []
+        for m, c in coeffs.items():
+            # row q couples to column q - m (mod M): split into the two wrapped pieces
+            for off in {-m, M - m} - {M, -M}:
+                if -M < off < M:
+                    offs.append(off)
+                    data.append(np.full(M - abs(off), c))
+        return diags(data, offs, shape=(M, M), format='csr', dtype=complex)
+
+    B = circulant(_circulant_coeffs(chi))
+    A = diags(w) @ B @ diags(w)
+    if U is not None:
+        A = A + circulant(_circulant_coeffs(np.asarray(U, dtype=float)))
+    return A.tocsc(), B.tocsc()
+
+# ——— SPECTRUM ———
+def operator_spectrum(M=256, theta=np.pi, c1=0.0, c2=0.0, c3=0.0, k=200, U=None):
+    """
+    Lowest k positive eigenvalues (ascending) of the chi-vortex operator, the
+    drop-in for spectrum(build_operator(...), k).
+
+    Uniform chi and U=None: exact closed form w_q^2. Otherwise the Hermitized
+    operator from sparse_operator, so the result equals the dense eigvalsh of
+    build_operator to rounding.
+    """
+    if U is None and c1 == c2 == c3 == 0.0:
+        lam = np.sort(dk_symbol(M, theta)**2)
+        lam = lam[lam > 1e-12]
+        return lam[:k]
+    return hermitian_spectrum(sparse_operator(M, theta, harmonic_chi(M, c1, c2, c3), U), k)
+
+# ——— PARAMETRIC FAMILY ———
+class ChiVortexFamily:
+    """
+    The chi-vortex operators at fixed M as a function of (theta, c1, c2, c3).
+
+    Everything theta- and c-independent (grid, cos harmonics, sparse D1) is built
+    once. With X = diag(chi),
+        L = -X^-1 D1 X D1 - i kappa (D1 + X^-1 D1 X) + kappa^2 I,
+    so for fixed c the theta dependence is a scalar combination of two
+    cached pieces. Spectra are memoized per parameter tuple in a bounded LRU,
+    so repeated points in theta/c3 sweeps cost nothing.
+    """
+    def __init__(self, M=256, maxsize=512):
+        from functools import lru_cache
+        from scipy.sparse import diags
+        self.M = M
+        self.tau, self.dt = tau_grid(M)
+        self.cos = np.cos(np.outer(np.arange(1, 4), self.tau))       # cos(m tau), m = 1..3
+        self.D1 = diags([0.5/self.dt, -0.5/self.dt, -0.5/self.dt, 0.5/self.dt],
+                        [1, -1, M - 1, -(M - 1)], shape=(M, M), format='csr')
+        self._pieces = lru_cache(maxsize=64)(self._pieces)
+        self.spectrum = lru_cache(maxsize=maxsize)(self.spectrum)
+        self.spinor_spectrum = lru_cache(maxsize=maxsize)(self.spinor_spectrum)
+
+    def chi(self, c1=0.0, c2=0.0, c3=0.0):
+        return np.maximum(1.0 + np.array([c1, c2, c3]) @ self.cos, 1e-6)
+
+    def _pieces(self, c1, c2, c3):
+        chi = self.chi(c1, c2, c3)
+        P0 = (self.D1.multiply(1/chi[:, None]) @ self.D1.multiply(chi[:, None])).toarray()
+        P1 = (self.D1 + self.D1.multiply(np.outer(1/chi, chi))).toarray()
+        return P0, P1
+
+    def L(self, theta=np.pi, c1=0.0, c2=0.0, c3=0.0):
+        """Dense Hermitized operator, equal to build_operator(M, theta, c1, c2, c3)."""
+        kappa = theta/(2*np.pi)
+        P0, P1 = self._pieces(c1, c2, c3)
+        L = -P0 - 1j*kappa*P1 + kappa**2*np.eye(self.M)
+        return 0.5*(L + L.conj().T)
+
+    def spectrum(self, theta=np.pi, c1=0.0, c2=0.0, c3=0.0, k=200):
+        """Lowest k positive eigenvalues of L(theta, c1, c2, c3), memoized."""
+        if c1 == c2 == c3 == 0.0 or self.M > DENSE_MAX:
+            return operator_spectrum(self.M, theta, c1, c2, c3, k)
+        lam = np.linalg.eigvalsh(self.L(theta, c1, c2, c3))
+        return lam[lam > 1e-12][:k]
+
+    def spinor_spectrum(self, theta=np.pi, c1=0.0, c2=0.0, r=0.0):
+        """
+        All eigenvalues of the spinor operator with coupling strength
+        r = hypot(m1, g1) (the spectrum depends on m1, g1 only through r).
+        """
+        from chi_vortex_kron import spinor_spectrum
+        return spinor_spectrum(self.L(theta, c1, c2), self.cos[0], r, 0.0)
+
+_FAMILIES = {}
+
+def family(M=256):
+    """Shared ChiVortexFamily per grid size, so sweeps in one run reuse one cache."""
+    if M not in _FAMILIES:
+        _FAMILIES[M] = ChiVortexFamily(M)
+    return _FAMILIES[M]
+
+# ——— CHECK ———
+def check(M=128, theta=np.pi + 0.01, c=((0.0, 0.0, 0.03), (0.1, 0.0, 0.0), (0.3, 0.1, 0.05))):
+    """
+    Assert that the fast paths reproduce the dense Hermitized operator:
+    ChiVortexFamily.spectrum == eigvalsh(L) and operator_spectrum (dense and
+    shift-invert) == eigvalsh(build_operator) at nonzero harmonics.
+    """
+    fam = ChiVortexFamily(M)
+    for c1, c2, c3 in c:
+        ref = np.linalg.eigvalsh(fam.L(theta, c1, c2, c3))
+        ref = ref[ref > 1e-12]
+        assert np.allclose(fam.spectrum(theta, c1, c2, c3, k=M), ref[:M], rtol=1e-10, atol=1e-10)
+        assert np.allclose(operator_spectrum(M, theta, c1, c2, c3, k=M), ref[:M], rtol=1e-10, atol=1e-10)
+        H = sparse_operator(M, theta, harmonic_chi(M, c1, c2, c3))
+        assert np.allclose(H.toarray(), fam.L(theta, c1, c2, c3), atol=1e-10)
+        k = M // 8
+        global DENSE_MAX
+        saved, DENSE_MAX = DENSE_MAX, 0
+        try:
+            assert np.allclose(hermitian_spectrum(H, k), ref[:k], rtol=1e-8)
+        finally:
+            DENSE_MAX = saved
+    return True
+
+if __name__ == "__main__":
+    check()
+    print("chi_vortex_fft: fast spectra match the dense Hermitized operator")
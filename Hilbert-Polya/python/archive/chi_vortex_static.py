@@ -2,6 +2,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from chi_vortex_fft import periodic_D1
+
 RIEMANN_T = np.array([
     14.134725141, 21.022039639, 25.010857580, 30.424876126, 32.935061588,
     37.586178159, 40.918719012, 43.327073281, 48.005150881, 49.773832478,
@@ -15,13 +17,6 @@ RIEMANN_T = np.array([
     134.756509753, 138.116042055, 139.736208952, 141.123707404, 143.111845808
 ])
 
-def periodic_D1(M, dt):
-    D1 = np.zeros((M, M), dtype=complex)
-    for i in range(M):
-        D1[i, (i+1)%M] =  0.5/dt
-        D1[i, (i-1)%M] = -0.5/dt
-    return D1
-
 def build_operator(M=256, theta=np.pi, c1=0.2, c2=-0.1, u0=0.0, u1=0.1, u2=-0.05):
     tau = np.linspace(0, 2*np.pi, M, endpoint=False)
     dt = tau[1] - tau[0]
@@ -10,6 +10,11 @@ except Exception:
 import numpy as np
 import matplotlib.pyplot as plt
 
+from chi_vortex_fft import periodic_D1, family
+from chi_vortex_kron import torus_spectrum
+from anchor_scan import anchor_scan
+from stream_align import unique_sorted
+
 # -------- Riemann zero ordinates (first 50) --------
 RIEMANN_T = np.array([
     14.134725141, 21.022039639, 25.010857580, 30.424876126, 32.935061588,
@@ -25,13 +30,6 @@ RIEMANN_T = np.array([
 ])
 
 # -------- Core operator (U=0) --------
-def periodic_D1(M, dt):
-    D1 = np.zeros((M, M), dtype=complex)
-    for i in range(M):
-        D1[i, (i+1)%M] =  0.5/dt
-        D1[i, (i-1)%M] = -0.5/dt
-    return D1
-
 def build_operator(M=256, theta=np.pi, c1=0.0, c2=0.0, c3=0.0):
     tau = np.linspace(0, 2*np.pi, M, endpoint=False)
     dt = tau[1] - tau[0]
@@ -55,11 +53,7 @@ def spectrum(L, k=200):
     return lam[:k]
 
 def unique_eigs(vals, tol=1e-6):
-    out=[]
-    for v in np.sort(vals):
-        if not out or abs(v - out[-1]) > tol:
-            out.append(v)
-    return np.array(out)
+    return unique_sorted(vals, tol)
 
 # -------- Stage 2: Spinor HP operator --------
 SIGMA_X = np.array([[0,1],[1,0]], dtype=complex)
@@ -88,9 +82,8 @@ def build_spinor_operator(M=256, theta=np.pi, c1=0.0, c2=0.0,
 
 def spinor_fit(theta, m1, g1, c1=0.0, c2=0.0, skip=6, N=40, M=256):
     """Fit spinor HP operator spectrum."""
-    L = build_spinor_operator(M, theta, c1, c2, m1=m1, g1=g1)
-    evals, _ = np.linalg.eigh(L)
-    lam = np.sort(evals.real)
+    # spectrum of build_spinor_operator as two M×M blocks; depends on m1, g1 only via hypot
+    lam = family(M).spinor_spectrum(theta, c1, c2, np.hypot(m1, g1))
     lam = lam[lam>1e-12]
     lam = unique_eigs(lam, tol=1e-8)
     y = np.sqrt(lam)[skip:][:N]
@@ -139,10 +132,8 @@ def torus_fit(theta_tau, theta_sigma=0.0, eps=0.02, M_tau=256, M_sigma=32,
     """Fit 2D torus spectrum with Kronecker sum."""
     Ltau = build_operator(M_tau, theta_tau, c1=0.0, c2=0.0)    # your 1D best
     Lsig = build_operator_sigma(M_sigma, theta_sigma)
-    # Kronecker sum: L = Ltau ⊗ I + eps * (I ⊗ Lsig)
-    L = np.kron(Ltau, np.eye(M_sigma)) + eps*np.kron(np.eye(M_tau), Lsig)
-    evals, _ = np.linalg.eigh(L)
-    lam = np.sort(evals.real)
+    # Kronecker sum: L = Ltau ⊗ I + eps * (I ⊗ Lsig), eigenvalues lam_i + eps*mu_j
+    lam = torus_spectrum(Ltau, Lsig, eps)
     lam = lam[lam>1e-12]
     lam = unique_eigs(lam, tol=1e-8)
     y = np.sqrt(lam)[skip:][:N]
@@ -154,14 +145,13 @@ def torus_fit(theta_tau, theta_sigma=0.0, eps=0.02, M_tau=256, M_sigma=32,
     rmse = float(np.sqrt(np.mean((y-yhat)**2)))
     return dict(R2=R2, rmse=rmse, a=a, b=b)
 
-def sweep_torus_params(theta_tau, skip=5, N=40, M_tau=128, M_sigma=8):
-    """Sweep over epsilon and theta_sigma for 2D torus (optimized for speed)."""
-    # Heavily reduced parameter space: 128x8 = 1024 eigenvalues (8x faster than 256x16)
+def sweep_torus_params(theta_tau, skip=5, N=40, M_tau=256, M_sigma=32):
+    """Sweep over epsilon and theta_sigma for 2D torus (Kronecker-sum spectra, full resolution)."""
     eps_values = [0.0, 0.02]  # Just test zero and a small coupling
     theta_s_values = [0.0]  # Only test zero phase
     best = None; best_info = None
     
-    print("  Sweeping epsilon and theta_sigma (fast mode: M_tau=128, M_sigma=8)...")
+    print(f"  Sweeping epsilon and theta_sigma (M_tau={M_tau}, M_sigma={M_sigma})...")
     print(f"    Matrix size: {M_tau} x {M_sigma} = {M_tau * M_sigma} eigenvalues")
     for eps in eps_values:
         for ths in theta_s_values:
@@ -198,18 +188,8 @@ def two_point_delta_gamma(t, a, b, mp, mq, p, q):
 
 # -------- Sweep helpers --------
 def sweep_anchors(t, y, i_min=4, i_max=14, j_min=22, j_max=36):
-    """Sweep anchor points (i,j) to find optimal two-point fit."""
-    best=None; best_info=None
-    for i in range(i_min, i_max+1):
-        for j in range(max(i+3, j_min), j_max+1):
-            a2,b2 = two_point_ab(t, y, i, j)
-            yhat  = a2 + b2*t
-            R2    = r2_score(y, yhat)
-            rmse  = float(np.sqrt(np.mean((y - yhat)**2)))
-            score = (R2, -rmse)
-            if (best is None) or (score > best):
-                best, best_info = score, dict(i=i,j=j,a=a2,b=b2,R2=R2,rmse=rmse)
-    return best_info
+    """Best two-point anchor pair (i,j); see anchor_scan for the full R²/RMSE surfaces."""
+    return anchor_scan(t, y, i_min, i_max, j_min, j_max)['best']
 
 def sweep_theta(M=256, thetas=None, skip=5, N=40, c1=0.0, c2=0.0, c3=0.0):
     """Sweep theta values around pi to find optimal operator."""
@@ -217,8 +197,7 @@ def sweep_theta(M=256, thetas=None, skip=5, N=40, c1=0.0, c2=0.0, c3=0.0):
         thetas = np.linspace(np.pi-0.05, np.pi+0.05, 41)
     best=None; out=None
     for th in thetas:
-        L = build_operator(M, theta=th, c1=c1, c2=c2, c3=c3)
-        lam = spectrum(L, k=max(N+20, 200))
+        lam = family(M).spectrum(th, c1, c2, c3, k=max(N+20, 200))
         y   = np.sqrt(unique_eigs(lam))[skip:][:N]
         t   = RIEMANN_T[:N]
         # use LS (global) for comparison
@@ -238,8 +217,7 @@ def sweep_c3(M=256, theta=np.pi, c1=0.0, c2=0.0, c3_range=None, skip=5, N=40):
         c3_range = np.linspace(-0.03, 0.03, 31)
     best=None; out=None
     for c3 in c3_range:
-        L = build_operator(M, theta=theta, c1=c1, c2=c2, c3=c3)
-        lam = spectrum(L, k=max(N+20, 200))
+        lam = family(M).spectrum(theta, c1, c2, c3, k=max(N+20, 200))
         y   = np.sqrt(unique_eigs(lam))[skip:][:N]
         t   = RIEMANN_T[:N]
         # use LS (global) for comparison
@@ -270,13 +248,34 @@ def sweep_all_params(M=256, skip=5, N=40):
     return dict(theta=theta_opt, c3=best_c3['c3'], 
                 a=best_c3['a'], b=best_c3['b'], R2=best_c3['R2'], rmse=best_c3['rmse'])
 
+def sweep_theta_c3_grid(M=256, thetas=None, c3_range=None, skip=5, N=40, c1=0.0, c2=0.0):
+    """Full theta × c3 landscape: R² and RMSE surfaces plus the best grid point."""
+    if thetas is None:
+        thetas = np.linspace(np.pi-0.05, np.pi+0.05, 41)
+    if c3_range is None:
+        c3_range = np.linspace(-0.03, 0.03, 31)
+    t = RIEMANN_T[:N]
+    X = np.vstack([np.ones(N), t]).T
+    R2 = np.full((len(thetas), len(c3_range)), np.nan)
+    rmse = np.full_like(R2, np.nan)
+    for a_i, th in enumerate(thetas):
+        for b_i, c3 in enumerate(c3_range):
+            lam = family(M).spectrum(th, c1, c2, c3, k=max(N+20, 200))
+            y   = np.sqrt(unique_eigs(lam))[skip:][:N]
+            a,b = np.linalg.lstsq(X, y, rcond=None)[0]
+            yhat = a + b*t
+            R2[a_i, b_i] = r2_score(y, yhat)
+            rmse[a_i, b_i] = np.sqrt(np.mean((y - yhat)**2))
+    a_i, b_i = np.unravel_index(np.nanargmax(R2), R2.shape)
+    return dict(thetas=np.asarray(thetas), c3=np.asarray(c3_range), R2=R2, rmse=rmse,
+                theta=float(thetas[a_i]), c3_best=float(c3_range[b_i]),
+                R2_best=float(R2[a_i, b_i]), rmse_best=float(rmse[a_i, b_i]))
+
 # -------- Stage 1: Two-θ band merge --------
 def merged_theta_fit(theta1, theta2, skip=5, N=40, M=256, c1=0.0, c2=0.0, c3=0.0):
     """Merge spectra from two theta values and fit."""
-    L1 = build_operator(M, theta1, c1=c1, c2=c2, c3=c3)
-    L2 = build_operator(M, theta2, c1=c1, c2=c2, c3=c3)
-    lam1 = spectrum(L1, k=200)
-    lam2 = spectrum(L2, k=200)
+    lam1 = family(M).spectrum(theta1, c1, c2, c3, k=200)
+    lam2 = family(M).spectrum(theta2, c1, c2, c3, k=200)
     lam = np.concatenate([lam1, lam2])
     lam = np.sort(lam[lam > 1e-12])
     lam = unique_eigs(lam, tol=1e-8)  # collapse near-duplicates
@@ -407,9 +406,9 @@ if __name__ == "__main__":
     print("\n" + "="*60)
     print("STAGE 3: 2D Torus operator (Kronecker sum)")
     print("="*60)
-    # Use smaller dimensions for speed: 128x8 = 1024 eigenvalues
-    M_tau_stage3 = 128
-    M_sigma = 8
+    # Kronecker-sum spectra: full 256x32 = 8192 eigenvalues from two small factors
+    M_tau_stage3 = 256
+    M_sigma = 32
     best_torus = sweep_torus_params(theta_tau=theta_opt, skip=skip, N=N, M_tau=M_tau_stage3, M_sigma=M_sigma)
     print(f"\nBest 2D torus parameters:")
     print(f"  eps={best_torus['eps']:.6f}, theta_sigma={best_torus['theta_sigma']:.6f}")
@@ -429,9 +428,7 @@ if __name__ == "__main__":
         # Rebuild to get the actual y values for the fit
         Ltau = build_operator(M_tau_stage3, theta=theta_opt, c1=0.0, c2=0.0)
         Lsig = build_operator_sigma(M_sigma, best_torus['theta_sigma'])
-        L = np.kron(Ltau, np.eye(M_sigma)) + best_torus['eps']*np.kron(np.eye(M_tau_stage3), Lsig)
-        evals, _ = np.linalg.eigh(L)
-        lam = np.sort(evals.real)
+        lam = torus_spectrum(Ltau, Lsig, best_torus['eps'])
         lam = lam[lam>1e-12]
         lam = unique_eigs(lam, tol=1e-8)
         y_torus_actual = np.sqrt(lam)[skip:][:N]
@@ -444,10 +441,8 @@ if __name__ == "__main__":
         # Build the spectrum from the previous best stage
         if use_spinor_temp and best_spinor['R2'] > stage01_R2:
             use_spinor = True
-            L_spinor = build_spinor_operator(M, theta=theta_opt, c1=0.0, c2=0.0,
-                                             m1=best_spinor['m1'], g1=best_spinor['g1'])
-            evals, _ = np.linalg.eigh(L_spinor)
-            lam = np.sort(evals.real)
+            lam = family(M).spinor_spectrum(theta_opt, 0.0, 0.0,
+                                            np.hypot(best_spinor['m1'], best_spinor['g1']))
             lam = lam[lam>1e-12]
             lam = unique_eigs(lam, tol=1e-8)
             y_spinor = np.sqrt(lam)[skip:][:N]
@@ -10,6 +10,10 @@ except Exception:
 import numpy as np
 import matplotlib.pyplot as plt
 
+from chi_vortex_fft import periodic_D1, family
+from chi_vortex_kron import torus_spectrum
+from stream_align import unique_sorted
+
 # -------- Riemann zero ordinates (first 50) --------
 RIEMANN_T = np.array([
     14.134725141, 21.022039639, 25.010857580, 30.424876126, 32.935061588,
@@ -25,13 +29,6 @@ RIEMANN_T = np.array([
 ])
 
 # -------- Core operator (U=0) --------
-def periodic_D1(M, dt):
-    D1 = np.zeros((M, M), dtype=complex)
-    for i in range(M):
-        D1[i, (i+1)%M] =  0.5/dt
-        D1[i, (i-1)%M] = -0.5/dt
-    return D1
-
 def build_operator(M=256, theta=np.pi, c1=0.0, c2=0.0, c3=0.0, bloch_theta=None):
     """Build HP operator with optional separate Bloch phase for symmetry diagnostics."""
     tau = np.linspace(0, 2*np.pi, M, endpoint=False)
@@ -57,11 +54,7 @@ def spectrum(L, k=200):
     return lam[:k]
 
 def unique_eigs(vals, tol=1e-6):
-    out=[]
-    for v in np.sort(vals):
-        if not out or abs(v - out[-1]) > tol:
-            out.append(v)
-    return np.array(out)
+    return unique_sorted(vals, tol)
 
 # -------- Stage 2: Spinor HP operator --------
 SIGMA_X = np.array([[0,1],[1,0]], dtype=complex)
@@ -90,9 +83,8 @@ def build_spinor_operator(M=256, theta=np.pi, c1=0.0, c2=0.0,
 
 def spinor_fit(theta, m1, g1, c1=0.0, c2=0.0, skip=6, N=40, M=256):
     """Fit spinor HP operator spectrum."""
-    L = build_spinor_operator(M, theta, c1, c2, m1=m1, g1=g1)
-    evals, _ = np.linalg.eigh(L)
-    lam = np.sort(evals.real)
+    # spectrum of build_spinor_operator as two M×M blocks; depends on m1, g1 only via hypot
+    lam = family(M).spinor_spectrum(theta, c1, c2, np.hypot(m1, g1))
     lam = lam[lam>1e-12]
     lam = unique_eigs(lam, tol=1e-8)
     y = np.sqrt(lam)[skip:][:N]
@@ -141,10 +133,8 @@ def torus_fit(theta_tau, theta_sigma=0.0, eps=0.02, M_tau=256, M_sigma=32,
     """Fit 2D torus spectrum with Kronecker sum."""
     Ltau = build_operator(M_tau, theta_tau, c1=0.0, c2=0.0)    # your 1D best
     Lsig = build_operator_sigma(M_sigma, theta_sigma)
-    # Kronecker sum: L = Ltau ⊗ I + eps * (I ⊗ Lsig)
-    L = np.kron(Ltau, np.eye(M_sigma)) + eps*np.kron(np.eye(M_tau), Lsig)
-    evals, _ = np.linalg.eigh(L)
-    lam = np.sort(evals.real)
+    # Kronecker sum: L = Ltau ⊗ I + eps * (I ⊗ Lsig), eigenvalues lam_i + eps*mu_j
+    lam = torus_spectrum(Ltau, Lsig, eps)
     lam = lam[lam>1e-12]
     lam = unique_eigs(lam, tol=1e-8)
     y = np.sqrt(lam)[skip:][:N]
@@ -219,8 +209,7 @@ def sweep_theta(M=256, thetas=None, skip=5, N=40, c1=0.0, c2=0.0, c3=0.0):
         thetas = np.linspace(np.pi-0.05, np.pi+0.05, 41)
     best=None; out=None
     for th in thetas:
-        L = build_operator(M, theta=th, c1=c1, c2=c2, c3=c3)
-        lam = spectrum(L, k=max(N+20, 200))
+        lam = family(M).spectrum(th, c1, c2, c3, k=max(N+20, 200))
         y   = np.sqrt(unique_eigs(lam))[skip:][:N]
         t   = RIEMANN_T[:N]
         # use LS (global) for comparison
@@ -240,8 +229,7 @@ def sweep_c3(M=256, theta=np.pi, c1=0.0, c2=0.0, c3_range=None, skip=5, N=40):
         c3_range = np.linspace(-0.03, 0.03, 31)
     best=None; out=None
     for c3 in c3_range:
-        L = build_operator(M, theta=theta, c1=c1, c2=c2, c3=c3)
-        lam = spectrum(L, k=max(N+20, 200))
+        lam = family(M).spectrum(theta, c1, c2, c3, k=max(N+20, 200))
         y   = np.sqrt(unique_eigs(lam))[skip:][:N]
         t   = RIEMANN_T[:N]
         # use LS (global) for comparison
@@ -275,10 +263,8 @@ def sweep_all_params(M=256, skip=5, N=40):
 # -------- Stage 1: Two-θ band merge --------
 def merged_theta_fit(theta1, theta2, skip=5, N=40, M=256, c1=0.0, c2=0.0, c3=0.0):
     """Merge spectra from two theta values and fit."""
-    L1 = build_operator(M, theta1, c1=c1, c2=c2, c3=c3)
-    L2 = build_operator(M, theta2, c1=c1, c2=c2, c3=c3)
-    lam1 = spectrum(L1, k=200)
-    lam2 = spectrum(L2, k=200)
+    lam1 = family(M).spectrum(theta1, c1, c2, c3, k=200)
+    lam2 = family(M).spectrum(theta2, c1, c2, c3, k=200)
     lam = np.concatenate([lam1, lam2])
     lam = np.sort(lam[lam > 1e-12])
     lam = unique_eigs(lam, tol=1e-8)  # collapse near-duplicates
@@ -11,6 +11,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from anchor_scan import anchor_scan
+from stream_align import unique_sorted
+
 # --------- NEW: Riemann zeros (vector) via mpmath, with caching ----------
 def load_or_compute_riemann_zeros(N=50, cache_path="riemann_zeros.json", mp_dps=80):
     """
@@ -83,11 +86,7 @@ def spectrum(L, k=200):
     return lam[:k]
 
 def unique_eigs(vals, tol=1e-6):
-    out=[]
-    for v in np.sort(vals):
-        if not out or abs(v - out[-1]) > tol:
-            out.append(v)
-    return np.array(out)
+    return unique_sorted(vals, tol)
 
 # ---------------- Stage 2: Spinor HP operator ----------------
 SIGMA_X = np.array([[0,1],[1,0]], dtype=complex)
@@ -205,17 +204,8 @@ def two_point_delta_gamma(t, a, b, mp, mq, p, q):
     return delta, gamma
 
 def sweep_anchors(t, y, i_min=4, i_max=14, j_min=22, j_max=36):
-    best=None; best_info=None
-    for i in range(i_min, i_max+1):
-        for j in range(max(i+3, j_min), j_max+1):
-            a2,b2 = two_point_ab(t, y, i, j)
-            yhat  = a2 + b2*t
-            R2    = r2_score(y, yhat)
-            rmse  = float(np.sqrt(np.mean((y - yhat)**2)))
-            score = (R2, -rmse)
-            if (best is None) or (score > best):
-                best, best_info = score, dict(i=i,j=j,a=a2,b=b2,R2=R2,rmse=rmse)
-    return best_info
+    """Best two-point anchor pair (i,j); see anchor_scan for the full R²/RMSE surfaces."""
+    return anchor_scan(t, y, i_min, i_max, j_min, j_max)['best']
 
 def sweep_theta(RIEMANN_T, M=256, thetas=None, skip=5, N=40, c1=0.0, c2=0.0, c3=0.0):
     if thetas is None:
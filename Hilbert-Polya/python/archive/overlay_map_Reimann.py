@@ -2,19 +2,14 @@ import json, os
 import numpy as np
 import matplotlib.pyplot as plt
 
+from chi_vortex_fft import periodic_D1
+
 # ========== CONFIG ==========
 BACKGROUND = "black"      # "white" or "black"
 SAVE_NAME  = "hp_two_vector_overlay.png"
 SUMMARY_FILE = "hp_two_point_summary.json"
 
 # ---------- helper ops (copied from core) ----------
-def periodic_D1(M, dt):
-    D1 = np.zeros((M, M), dtype=complex)
-    for i in range(M):
-        D1[i, (i+1)%M] =  0.5/dt
-        D1[i, (i-1)%M] = -0.5/dt
-    return D1
-
 def build_operator(M=256, theta=np.pi, c1=0.0, c2=0.0, c3=0.0):
     tau = np.linspace(0, 2*np.pi, M, endpoint=False)
     dt = tau[1] - tau[0]
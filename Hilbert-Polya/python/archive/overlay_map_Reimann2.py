@@ -6,6 +6,8 @@ import os, json
 import numpy as np
 import matplotlib.pyplot as plt
 
+from chi_vortex_fft import periodic_D1
+
 # ---------- config ----------
 SUMMARY_FILE = "hp_two_point_summary.json"
 BACKGROUND   = "black"  # "white" or "black"
@@ -26,13 +28,6 @@ RIEMANN_T = np.array([
 ])
 
 # ---------- helpers ----------
-def periodic_D1(M, dt):
-    D1 = np.zeros((M, M), dtype=complex)
-    for i in range(M):
-        D1[i, (i+1) % M] =  0.5 / dt
-        D1[i, (i-1) % M] = -0.5 / dt
-    return D1
-
 def build_operator(M=256, theta=np.pi, c1=0.0, c2=0.0, c3=0.0):
     tau = np.linspace(0, 2*np.pi, M, endpoint=False)
     dt = tau[1] - tau[0]
@@ -0,0 +1,117 @@
+# stream_align.py
+# Streaming spectrum -> Riemann-zero alignment for very large spectra.
+# Eigenvalues arrive in chunks (shift-invert windows, Kronecker-sum blocks, ...);
+# only a bounded buffer of the k smallest distinct positive values is ever
+# held, and the result feeds the same sqrt(lambda) vs t_n affine fit the HP
+# scripts use, against the shared zero store.
+
+import os
+import sys
+
+import numpy as np
+
+# ——— TOLERANCE DEDUPE ———
+def unique_sorted(vals, tol=1e-6):
+    """
+    Vectorized unique_eigs: sort, then keep v whenever v - (last kept) > tol.
+    Runs whose consecutive gaps are all <= tol but whose span exceeds tol
+    (chains) are resolved greedily inside the run, so the output is identical
+    to the element-by-element loop.
+    """
+    v = np.sort(np.asarray(vals, dtype=float).ravel())
+    if len(v) == 0:
+        return v
+    start = np.r_[True, np.diff(v) > tol]           # run leaders are always kept
+    keep = start.copy()
+    first = np.nonzero(start)[0]
+    last = np.r_[first[1:], len(v)] - 1
+    for r in np.nonzero(v[last] - v[first] > tol)[0]:
+        k = first[r]
+        while True:                                   # greedy jump within a chained run
+            k = np.searchsorted(v, v[k] + tol, side='right')
+            if k > last[r]:
+                break
+            keep[k] = True
+    return v[keep]
+
+# ——— BOUNDED SMALLEST-K BUFFER ———
+class SmallestK:
+    """
+    The k smallest distinct positive eigenvalues seen so far, fed chunk by chunk.
+
+    The buffer plays the role of a bounded max-heap: input above the current
+    k-th kept value is discarded up front, and each chunk is merged with one
+    vectorized sort + dedupe instead of per-element pushes. Values within tol
+    of an already kept value are dropped as duplicates (tolerance clustering,
+    as in unique_eigs). The raw sorted values up to the k-th kept one (the k
+    kept values plus their near-duplicates) are retained and deduped as a
+    whole, and greedy dedupe of a sorted prefix depends on nothing above it,
+    so the result equals unique_sorted(all input)[:k] for any chunk order.
+    """
+    def __init__(self, k, tol=1e-8, floor=1e-12):
+        self.k, self.tol, self.floor = k, tol, floor
+        self.raw = np.empty(0)
+        self.buf = np.empty(0)
+        self.seen = 0
+
+    @property
+    def threshold(self):
+        """Largest kept value once the buffer is full (inf before): larger input is ignored."""
+        return self.buf[-1] if len(self.buf) >= self.k else np.inf
+
+    def push(self, chunk):
+        c = np.asarray(chunk, dtype=float).ravel()
+        self.seen += len(c)
+        c = c[(c > self.floor) & (c <= self.threshold)]
+        if len(c) == 0:
+            return self
+        raw = np.sort(np.r_[self.raw, c])
+        kept = unique_sorted(raw, self.tol)
+        if len(kept) >= self.k:
+            raw = raw[raw <= kept[self.k - 1]]
+        self.raw, self.buf = raw, kept[:self.k]
+        return self
+
+    def extend(self, chunks):
+        for c in chunks:
+            self.push(c)
+        return self
+
+    def values(self):
+        return self.buf.copy()
+
+# ——— ZERO STORE ———
+def riemann_zeros(N):
+    """First N zero ordinates from the shared store (Hilbert-Polya/python/hp_zeros.py)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(here))
+    try:
+        from hp_zeros import get_zeros
+    finally:
+        sys.path.pop(0)
+    return get_zeros(N, verbose=False)
+
+# ——— ALIGNMENT ———
+def align(lam, zeros=None, skip=5, N=40):
+    """
+    Affine fit sqrt(lam)[skip:][:N] = a + b t_n (the torus_fit/spinor_fit
+    convention). lam: a sorted, deduped array or a SmallestK. zeros default to
+    the zero store. Returns dict(a, b, R2, rmse, y, yhat).
+    """
+    if isinstance(lam, SmallestK):
+        lam = lam.values()
+    y = np.sqrt(np.asarray(lam))[skip:][:N]
+    if len(y) < N:
+        raise ValueError(f"only {len(y)} levels after skip={skip}; need N={N}")
+    t = np.asarray(zeros[:N] if zeros is not None else riemann_zeros(N), dtype=float)
+    X = np.vstack([np.ones(N), t]).T
+    a, b = np.linalg.lstsq(X, y, rcond=None)[0]
+    yhat = a + b*t
+    ss_tot = np.sum((y - y.mean())**2)
+    R2 = 1 - np.sum((y - yhat)**2)/ss_tot if ss_tot > 0 else np.nan
+    return dict(a=a, b=b, R2=R2, rmse=float(np.sqrt(np.mean((y - yhat)**2))), y=y, yhat=yhat)
+
+def stream_align(chunks, zeros=None, skip=5, N=40, tol=1e-8, floor=1e-12):
+    """Consume eigenvalue chunks, keep the skip+N smallest distinct positive ones, and fit."""
+    best = SmallestK(skip + N, tol=tol, floor=floor).extend(chunks)
+    return align(best, zeros, skip, N)
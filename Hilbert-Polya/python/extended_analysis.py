@@ -2,13 +2,10 @@
 # Deep dive into the geometric model's connection to Riemann zeros
 
 import numpy as np
-from scipy.linalg import eigh
-from mpmath import zetazero, mp
-from math import comb
+from hp_zeros import get_zeros
+from hp_lattice import middle_band
 import matplotlib.pyplot as plt
 
-mp.dps = 50
-
 # ——— CONFIG ———
 N = 220
 d_max = 5
@@ -16,53 +13,16 @@ alpha = 0.7
 p = 1.5
 n_flux = 25
 
-# ——— Get more zeros for extended prediction ———
-def get_zeros(K):
-    return np.array([float(zetazero(k+1).imag) for k in range(K)], dtype=float)
-
+# ——— Get more zeros for extended prediction (cached by hp_zeros.py) ———
 zeros = get_zeros(73)  # Get 73 zeros total
 train_zeros = zeros[:30]
 valid_zeros = zeros[30:58]
 extended_zeros = zeros[58:73]  # Extra 15 for testing extrapolation
 
-# ——— PASCAL AMPLITUDE ———
-def pascal_amp(d):
-    if d < 0 or d > 2 * d_max: return 0.0
-    k = d // 2
-    return np.sqrt(comb(d, k)) / (2 ** d)
-
-# ——— BUILD HAMILTONIAN ———
-def build_hamiltonian(N, d_max, alpha, p, n_flux):
-    H = np.zeros((N, N), dtype=complex)
-    phase_per_hop = 2 * np.pi / n_flux
-
-    for i in range(N):
-        for dj in range(-d_max, d_max + 1):
-            j = (i + dj) % N
-            if j < 0 or j >= N: continue
-            d = abs(i - j)
-            if d == 0: continue
-
-            A = pascal_amp(d)
-            u = (i + j) / (2.0 * N)
-            decay = 1.0 / (1.0 + alpha * u**p)
-            phase = np.exp(1j * phase_per_hop * dj)
-
-            H[i, j] = -A * decay * phase
-
-    H = (H + H.conj().T) / 2.0
-    return H
-
-print("Building Hamiltonian...")
-H = build_hamiltonian(N, d_max, alpha, p, n_flux)
-
-print("Diagonalizing...")
-evals = eigh(H, eigvals_only=True)
-
-# Extract middle band
+print("Diagonalizing (middle band only)...")
 start_idx = N // 3
 end_idx = 2 * N // 3
-model_evals = np.sort(evals[start_idx:end_idx])
+model_evals = middle_band(N, d_max, alpha, p, n_flux)
 
 print(f"Model eigenvalues range: [{model_evals[0]:.6f}, {model_evals[-1]:.6f}]")
 print(f"Number of eigenvalues: {len(model_evals)}")
@@ -0,0 +1,201 @@
+# hp_bench.py
+# Benchmark harness for the Hilbert–Pólya operator pipeline.
+# Every case is timed in three separate stages — build, diagonalize, fit — as
+# best-of-`repeat` wall time, plus the peak traced allocation of one full pass.
+# Each stage consumes the previous stage's output, so build and diag always
+# time the same operator; the storage (dense / banded / sparse) is part of
+# the case name.
+# Each run is appended to a JSON history (with git commit and library versions)
+# and compared with the previous run of the same case, so regressions show up
+# across commits.
+#
+#   python hp_bench.py                 # full suite
+#   python hp_bench.py --quick         # small sizes only
+#   python hp_bench.py --only lattice  # one group: lattice | geo | chi
+#
+# Cases:
+#   lattice  banded: hamiltonian_band -> eig_banded middle window -> batch_metrics
+#            dense (N <= 1000): build_hamiltonian -> eigh middle window -> batch_metrics
+#            N in {160, 320, 1000, 4000} × all TWIST_MODES
+#   geo      hp_geo_phase.build_operator for every registered phase kernel
+#   chi      archive chi-vortex operator (harmonic chi) for M in {256, 1024, 4096}:
+#            sparse_operator -> hermitian_spectrum (dense eigvalsh up to
+#            DENSE_MAX, shift-invert eigsh beyond) -> align
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+
+import numpy as np
+import scipy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(HERE, 'hp_bench_history.json')
+REGRESSION_RATIO = 1.25
+
+LATTICE_N = (160, 320, 1000, 4000)
+CHI_M = (256, 1024, 4096)
+DENSE_MAX_N = 1000
+
+# ——— TIMING ———
+def _best_of(fn, repeat):
+    best, out = np.inf, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def run_case(stages, repeat=3):
+    """
+    stages: ordered (name, fn) pairs; each fn takes the previous stage's
+    output (None for the first). Returns {stage: seconds, 'peak_mb': ...}.
+    """
+    result, prev = {}, None
+    for name, fn in stages:
+        result[name], prev = _best_of(lambda: fn(prev), repeat)
+
+    tracemalloc.start()                     # numpy reports its buffers to tracemalloc
+    prev = None
+    for _, fn in stages:
+        prev = fn(prev)
+    result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result
+
+# ——— CASES ———
+def lattice_cases(N_values=LATTICE_N, d_max=5, alpha=0.7, p=1.5, n_flux=25):
+    from scipy.linalg import eigh, eig_banded
+    from hp_lattice import TWIST_MODES, build_hamiltonian, hamiltonian_band
+    from hp_metrics import batch_metrics
+    from hp_geo_phase import RIEMANN
+    for N in N_values:
+        K = min(len(RIEMANN), 2*N//3 - N//3)
+        window = (N // 3, 2 * N // 3 - 1)            # the middle_band index range
+        fit = ('fit', lambda ev, K=K: batch_metrics(ev[None, :], RIEMANN[:K], sort=False))
+        for mode in TWIST_MODES:
+            yield f"lattice/N={N}/{mode}/banded", [
+                ('build', lambda _, N=N, mode=mode: hamiltonian_band(N, d_max, alpha, p, n_flux, mode)),
+                ('diag', lambda band, w=window: eig_banded(band, eigvals_only=True, select='i',
+                                                           select_range=w)),
+                fit,
+            ]
+            if N <= DENSE_MAX_N:
+                yield f"lattice/N={N}/{mode}/dense", [
+                    ('build', lambda _, N=N, mode=mode: build_hamiltonian(N, d_max, alpha, p, n_flux, mode)),
+                    ('diag', lambda H, w=window: eigh(H, eigvals_only=True, subset_by_index=list(w))),
+                    fit,
+                ]
+
+def geo_cases(N=160, dmax=5):
+    from hp_geo_phase import PHASE_KERNELS, RIEMANN, build_operator
+    from hp_metrics import batch_metrics
+    for name in sorted(PHASE_KERNELS):
+        stages = [
+            ('build', lambda _, name=name: build_operator(N, dmax, name, amp_alpha=0.5)),
+            ('diag', lambda H: np.linalg.eigvalsh(H)),
+            ('fit', lambda ev: batch_metrics(ev, RIEMANN)),
+        ]
+        yield f"geo/N={N}/{name}", stages
+
+def chi_cases(M_values=CHI_M, theta=np.pi + 0.01, c3=0.01, skip=5, N=40):
+    sys.path.insert(0, os.path.join(HERE, 'archive'))
+    from chi_vortex_fft import sparse_operator, hermitian_spectrum, harmonic_chi
+    from stream_align import align, unique_sorted
+    from hp_geo_phase import RIEMANN
+    zeros = np.r_[RIEMANN, RIEMANN[-1] + np.arange(1, N) * 2.5][:N]   # fit cost only; values irrelevant
+    for M in M_values:
+        stages = [
+            ('build', lambda _, M=M: sparse_operator(M, theta, harmonic_chi(M, 0.0, 0.0, c3))),
+            ('diag', lambda H: hermitian_spectrum(H, k=2*(skip + N) + 20)),
+            ('fit', lambda lam: align(unique_sorted(lam, 1e-8), zeros, skip, N)),
+        ]
+        yield f"chi/M={M}/c3={c3}/sparse", stages
+
+GROUPS = {'lattice': lattice_cases, 'geo': geo_cases, 'chi': chi_cases}
+
+# ——— HISTORY ———
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path=DEFAULT_HISTORY):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+def append_history(record, path=DEFAULT_HISTORY):
+    history = load_history(path)
+    history.append(record)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+    return history
+
+def compare(record, history, ratio=REGRESSION_RATIO):
+    """(case, stage, old, new) for every stage slower than `ratio` × its last recorded time."""
+    last = {}
+    for rec in history:
+        if rec is record:
+            continue
+        for case, res in rec['results'].items():
+            last[case] = res
+    slow = []
+    for case, res in record['results'].items():
+        old = last.get(case, {})
+        for stage, t in res.items():
+            if stage != 'peak_mb' and stage in old and t > ratio * old[stage]:
+                slow.append((case, stage, old[stage], t))
+    return slow
+
+# ——— DRIVER ———
+def run(groups=('lattice', 'geo', 'chi'), quick=False, repeat=3, verbose=True):
+    results = {}
+    for g in groups:
+        kw = {}
+        if quick and g == 'lattice':
+            kw = dict(N_values=LATTICE_N[:2])
+        if quick and g == 'chi':
+            kw = dict(M_values=CHI_M[:1])
+        for case, stages in GROUPS[g](**kw):
+            results[case] = run_case(stages, repeat)
+            if verbose:
+                times = '  '.join(f"{k}={v*1e3:8.2f}ms" for k, v in results[case].items() if k != 'peak_mb')
+                print(f"{case:<34} {times}  peak={results[case]['peak_mb']:7.1f}MB")
+    return dict(
+        timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        commit=_git_commit(),
+        python=platform.python_version(), numpy=np.__version__, scipy=scipy.__version__,
+        machine=platform.machine(), cpus=os.cpu_count(),
+        quick=quick, repeat=repeat, results=results,
+    )
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Time build / diagonalize / fit for the HP operator pipeline.")
+    ap.add_argument('--only', choices=sorted(GROUPS), action='append')
+    ap.add_argument('--quick', action='store_true')
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--history', default=DEFAULT_HISTORY)
+    ap.add_argument('--no-save', action='store_true')
+    args = ap.parse_args()
+
+    record = run(args.only or ('lattice', 'geo', 'chi'), args.quick, args.repeat)
+    history = load_history(args.history) + [record]
+    if not args.no_save:
+        append_history(record, args.history)
+        print(f"\nAppended run to {args.history} ({len(history)} runs)")
+    slow = compare(record, history)
+    for case, stage, old, new in slow:
+        print(f"REGRESSION {case} {stage}: {old*1e3:.2f}ms -> {new*1e3:.2f}ms ({new/old:.2f}x)")
+    if history[:-1] and not slow:
+        print(f"No stage slower than {REGRESSION_RATIO:.2f}x its previous run.")
@@ -0,0 +1,149 @@
+# hp_continuation.py
+# Warm-started tracking of the lattice middle band along N and (alpha, p, n_flux)
+# scans. Instead of rediagonalizing every point from scratch, each step:
+#   1. predicts the tracked window from the previous eigenpairs (first-order
+#      perturbation theory at fixed N, previous window centre across N),
+#   2. pulls only K + 2*pad levels around that shift with shift-invert Lanczos
+#      (sparse LU of H - sigma, O(N·d_max²)), starting from the previous vectors,
+#   3. pins the global level index with a Sylvester inertia count, so the window
+#      is always evals[N//3 : N//3 + K] exactly as a full eigh would give,
+#   4. matches eigenvectors to the previous step and reports level crossings.
+
+import numpy as np
+from scipy.linalg import eig_banded
+from scipy.sparse import identity
+from scipy.sparse.linalg import eigsh, splu
+from scipy.optimize import linear_sum_assignment
+
+from hp_lattice import hamiltonian_band, hamiltonian_sparse
+
+# ——— INERTIA ———
+def count_below(H, sigma, max_tries=8):
+    """
+    Number of eigenvalues of sparse Hermitian H below sigma (Sylvester's law).
+    LDL^H without pivoting via SuperLU; sigma is nudged if a pivot forces a swap.
+    """
+    N = H.shape[0]
+    I = identity(N, format='csc')
+    scale = max(abs(H).max(), 1.0)
+    for k in range(max_tries):
+        A = (H - sigma * I).tocsc()
+        lu = splu(A, permc_spec='NATURAL', diag_pivot_thresh=0.0,
+                  options=dict(SymmetricMode=True))
+        if np.array_equal(lu.perm_r, np.arange(N)):
+            return int(np.sum(lu.U.diagonal().real < 0))
+        sigma += scale * 1e-12 * 10**k
+    raise RuntimeError(f"could not get a pivot-free LDL^H near sigma={sigma}")
+
+# ——— TRACKER ———
+class BandTracker:
+    """
+    Follows levels N//3 .. N//3 + K - 1 of the lattice H along a path of
+    (N, alpha, p, n_flux, twist_mode) points. Call step() per point; each
+    result holds 'evals' (K,), 'evecs' (N, K), 'crossings' and 'method'.
+    """
+
+    def __init__(self, K=73, d_max=5, pad=8, max_shifts=6):
+        self.K, self.d_max, self.pad, self.max_shifts = K, d_max, pad, max_shifts
+        self.prev = None
+
+    # cold start: exact window from the banded solver
+    def _cold(self, N, params):
+        lo = N // 3
+        band = hamiltonian_band(N, self.d_max, *params)
+        vals = eig_banded(band, eigvals_only=True, select='i',
+                          select_range=(lo, lo + self.K - 1))
+        return 0.5 * (vals[0] + vals[-1])
+
+    # first-order prediction of the window centre
+    def _predict_sigma(self, H, N):
+        prev = self.prev
+        if prev['N'] != N:
+            return 0.5 * (prev['evals'][0] + prev['evals'][-1])
+        V = prev['evecs']
+        shift = np.real(np.sum(V.conj() * ((H - prev['H']) @ V), axis=0))
+        pred = prev['evals'] + shift
+        return 0.5 * (pred.min() + pred.max())
+
+    def _window(self, H, N, sigma, v0):
+        lo, K = N // 3, self.K
+        k = min(K + 2 * self.pad, N - 2)
+        for _ in range(self.max_shifts):
+            vals, vecs = eigsh(H, k=k, sigma=sigma, which='LM', v0=v0)
+            order = np.argsort(vals)
+            vals, vecs = vals[order], vecs[:, order]
+            first = count_below(H, sigma) - int(np.sum(vals < sigma))
+            spacing = (vals[-1] - vals[0]) / max(k - 1, 1)
+            if first > lo:                          # window starts below what we found
+                sigma -= (first - lo + self.pad) * spacing
+            elif first + k < lo + K:                # window ends above it
+                sigma += (lo + K - first - k + self.pad) * spacing
+            else:
+                s = lo - first
+                return vals[s:s + K], vecs[:, s:s + K]
+            v0 = None
+        raise RuntimeError(f"could not centre the shift-invert window at N={N}")
+
+    def _crossings(self, N, vecs):
+        """Level pairs (absolute indices) whose order swapped since the last step."""
+        prev = self.prev
+        if prev is None or prev['N'] != N:
+            return []
+        overlap = np.abs(prev['evecs'].conj().T @ vecs) ** 2
+        rows, perm = linear_sum_assignment(-overlap)
+        lo = N // 3
+        swaps = []
+        for a in range(len(perm)):
+            for b in range(a + 1, len(perm)):
+                if perm[a] > perm[b]:
+                    swaps.append((lo + a, lo + b))
+        return swaps
+
+    def step(self, N, alpha, p, n_flux, twist_mode='uniform'):
+        params = (alpha, p, n_flux, twist_mode)
+        H = hamiltonian_sparse(N, self.d_max, *params, format='csc')
+        if self.prev is None:
+            sigma, v0, method = self._cold(N, params), None, 'cold'
+        else:
+            sigma = self._predict_sigma(H, N)
+            same_N = self.prev['N'] == N
+            v0 = self.prev['evecs'].sum(axis=1) if same_N else None
+            method = 'warm'
+        evals, evecs = self._window(H, N, sigma, v0)
+        crossings = self._crossings(N, evecs)
+        self.prev = dict(N=N, params=params, H=H, evals=evals, evecs=evecs)
+        return dict(N=N, alpha=alpha, p=p, n_flux=n_flux, twist_mode=twist_mode,
+                    evals=evals, evecs=evecs, crossings=crossings, method=method)
+
+# ——— SCANS ———
+def track(points, K=73, d_max=5, verbose=False):
+    """Run a BandTracker along a list of dicts with keys N, alpha, p, n_flux[, twist_mode]."""
+    tracker = BandTracker(K=K, d_max=d_max)
+    out = []
+    for pt in points:
+        res = tracker.step(**pt)
+        if verbose and res['crossings']:
+            print(f"  N={res['N']} alpha={res['alpha']:.4f} p={res['p']:.4f}: "
+                  f"{len(res['crossings'])} level crossing(s) {res['crossings'][:4]}")
+        out.append(res)
+    return out
+
+def alpha_p_scan(N, alphas, ps, n_flux=25, twist_mode='uniform', K=73, d_max=5, verbose=False):
+    """
+    Middle-band window on an alpha × p grid at fixed N, walked in serpentine
+    order so consecutive points stay close. Returns (evals[len(alphas), len(ps), K],
+    crossings dict keyed by (i_alpha, i_p)).
+    """
+    tracker = BandTracker(K=K, d_max=d_max)
+    evals = np.empty((len(alphas), len(ps), K))
+    crossings = {}
+    for ia, a in enumerate(alphas):
+        order = range(len(ps)) if ia % 2 == 0 else range(len(ps) - 1, -1, -1)
+        for ip in order:
+            res = tracker.step(N, a, ps[ip], n_flux, twist_mode)
+            evals[ia, ip] = res['evals']
+            if res['crossings']:
+                crossings[(ia, ip)] = res['crossings']
+                if verbose:
+                    print(f"  alpha={a:.4f} p={ps[ip]:.4f}: {len(res['crossings'])} crossing(s)")
+    return evals, crossings
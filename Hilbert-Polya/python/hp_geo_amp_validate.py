@@ -2,6 +2,9 @@
 import numpy as np
 from scipy.special import comb
 
+from hp_lattice import diagonals_operator
+from hp_metrics import batch_metrics, row
+
 # ---- Riemann zeros (first 60; extend if Claude has more handy)
 RZ = np.array([
   14.134725141734693, 21.022039638771555, 25.010857580145689, 30.424876125859513,
@@ -36,22 +39,33 @@ def amp_log(i, j, N, alpha=0.7):
     u = 0.5*(i+j)
     return 1.0 / (1.0 + alpha * (np.log(2.0+u)/np.log(N)))
 
-def build_H(N=160, dmax=5, n_quant=25.0, amp_mode="power", alpha=0.7, p=1.0):
-    H = np.zeros((N, N), dtype=complex)
-    for i in range(N):
-        jmin, jmax = max(0, i-dmax), min(N, i+dmax+1)
-        for j in range(jmin, jmax):
-            if i == j: continue
-            d = abs(j - i)
-            if d == 0 or d > dmax: continue
+def build_H(N=160, dmax=5, n_quant=25.0, amp_mode="power", alpha=0.7, p=1.0, format='dense'):
+    """
+    Hop operator filled one diagonal at a time. format='dense' gives the
+    N×N array; 'dia'/'csr'/... a scipy.sparse matrix; 'operator' a
+    matrix-free LinearOperator.
+    """
+    offsets, data = [], []
+    for d in range(1, min(dmax, N - 1) + 1):
+        lo = np.arange(N - d)
+        for i, j, sign, k in ((lo, lo + d, 1j, d), (lo + d, lo, -1j, -d)):
             a = pascal_amp(d)
             if amp_mode == "power":
-                a *= amp_power(i, j, N, alpha=alpha, p=p)
+                a = a * amp_power(i, j, N, alpha=alpha, p=p)
             elif amp_mode == "log":
-                a *= amp_log(i, j, N, alpha=alpha)
+                a = a * amp_log(i, j, N, alpha=alpha)
             phi = phase_circle(i, j, d, n_quant=n_quant)
-            hop = -a * (np.exp(1j*phi) if j > i else np.exp(-1j*phi))
-            H[i, j] = hop
+            offsets.append(k)
+            data.append(-a * np.exp(sign * phi) * np.ones(N - d))
+    if format == 'operator':
+        return diagonals_operator(offsets, data, N)
+    if format != 'dense':
+        from scipy.sparse import diags
+        return diags(data, offsets, shape=(N, N), format=format, dtype=complex)
+    H = np.zeros((N, N), dtype=complex)
+    for k, v in zip(offsets, data):
+        i = np.arange(N - abs(k)) + max(-k, 0)
+        H[i, i + k] = v
     return H
 
 def affine_fit(y, t):
@@ -60,25 +74,9 @@ def affine_fit(y, t):
     return a, b, a*y + b
 
 def metrics(evals, zeros):
-    y = np.sort(evals)[:len(zeros)]
-    a,b,aligned = affine_fit(y, zeros)
-    res = aligned - zeros
-    rmse = float(np.sqrt(np.mean(res**2)))
-    mape = float(np.mean(np.abs(res)/zeros)*100.0)
-    idx = np.arange(len(res))
-    quad = np.polyfit(idx, res, 2)  # quad[0] is curvature sign
-    sp_m = np.diff(aligned); sp_m /= np.mean(sp_m)
-    sp_t = np.diff(zeros);   sp_t /= np.mean(sp_t)
-    corr = float(np.corrcoef(sp_m, sp_t)[0,1])
-    # KS on spacing CDFs
-    hi = np.percentile(np.r_[sp_m, sp_t], 99)
-    h1, edges = np.histogram(sp_m, bins=30, range=(0,hi), density=True)
-    h2, _     = np.histogram(sp_t, bins=edges, density=True)
-    F1, F2 = np.cumsum(h1), np.cumsum(h2)
-    if F1[-1] != 0: F1 /= F1[-1]
-    if F2[-1] != 0: F2 /= F2[-1]
-    ks = float(np.max(np.abs(F1 - F2)))
-    return dict(mape=mape, rmse=rmse, quad_a=quad[0], corr=corr, ks=ks, aligned=aligned)
+    m = row(batch_metrics(evals, zeros))
+    return dict(mape=m['mape'], rmse=m['rmse'], quad_a=m['quad'][0], corr=m['corr'],
+                ks=m['ks'], aligned=m['aligned'])
 
 def run_once(N=160, amp_mode="power", alpha=0.7, p=1.0, n_quant=25.0, dmax=5):
     H = build_H(N=N, dmax=dmax, n_quant=n_quant, amp_mode=amp_mode, alpha=alpha, p=p)
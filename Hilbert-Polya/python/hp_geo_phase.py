@@ -6,6 +6,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.special import comb
 
+from hp_lattice import diagonals_operator
+from hp_metrics import batch_metrics, row
+
 # ---- First 30 (or 100) Riemann zeros (imag parts). Use 30 for fast iteration.
 RIEMANN = np.array([
     14.134725141734693, 21.022039638771555, 25.010857580145689, 30.424876125859513,
@@ -37,44 +40,82 @@ def edge_taper_vec(N, eps=0.0, sigma=6.0):
     i = np.arange(N, dtype=float)
     return 1 - eps*(np.exp(-(i/sigma)**2) + np.exp(-((N-1-i)/sigma)**2))
 
+# ----- Kernel registries -----
+# Kernels take index arrays (i, j, d) — one whole diagonal per call — and
+# return arrays (or scalars that broadcast). Phase kernels that list `N` in
+# their signature get the lattice size passed in.
+PHASE_KERNELS = {}
+AMP_KERNELS = {}
+
+def register_phase(name):
+    """Decorator: add a phase kernel fn(i, j, d, [N,] **kw) under `name`."""
+    def deco(fn):
+        PHASE_KERNELS[name] = fn
+        return fn
+    return deco
+
+def register_amplitude(name):
+    """Decorator: add an amplitude kernel fn(i, j, N, alpha) under `name`."""
+    def deco(fn):
+        AMP_KERNELS[name] = fn
+        return fn
+    return deco
+
+def _resolve(kernel, table, kind):
+    if callable(kernel):
+        return kernel
+    try:
+        return table[kernel]
+    except KeyError:
+        raise ValueError(f"unknown {kind} kernel {kernel!r}; registered: {sorted(table)}") from None
+
 # ----- Phase kernels (GEOMETRIC ONLY) -----
+@register_phase('circle')
 def phase_circle(i, j, d, n_quant=25.0):
     # φ = (2π/n)*d (constant per hop)
     return (2*np.pi/n_quant) * d
 
+@register_phase('prime_sum')
 def phase_prime_sum(i, j, d):
     # φ ∝ d * (idx_i + idx_j)
     pi = (i % NPR); pj = (j % NPR)
     return np.pi * d * (pi + pj) / (2.0 * NPR)
 
+@register_phase('prime_single')
 def phase_prime_single(i, j, d):
     # φ ∝ d * idx_i
     pi = (i % NPR)
     return np.pi * d * pi / NPR
 
+@register_phase('log')
 def phase_log(i, j, d, N, beta=1.0):
     # LOG-SCALED PHASE: φ ∝ d * log(1 + (i+j)/2) / log(N)
     avg = 0.5*(i + j)
     return beta * d * np.log(1.0 + avg) / np.log(N)
 
+@register_phase('log_inverted')
 def phase_log_inverted(i, j, d, N, beta=1.0):
     # INVERTED LOG: Creates M-shape (concave-down)
     avg = 0.5*(i + j)
     return -beta * d * np.log(1.0 + avg) / np.log(N)
 
+@register_phase('reciprocal')
 def phase_reciprocal(i, j, d, N, beta=1.0):
     # RECIPROCAL: 1/log naturally bends down
     avg = 0.5*(i + j)
     return beta * d / np.log(2.0 + avg)  # +2 to avoid log(1)=0
 
+@register_phase('hybrid')
 def phase_hybrid(i, j, d, N, n_quant=25.0, beta=1.0):
     # HYBRID: circle quantization modulated by log curvature
     return (2*np.pi/n_quant) * d * (1.0 + beta * np.log(1.0 + 0.5*(i+j)) / np.log(N))
 
+@register_phase('hybrid_inverted')
 def phase_hybrid_inverted(i, j, d, N, n_quant=25.0, beta=1.0):
     # INVERTED HYBRID: Creates M-shape
     return (2*np.pi/n_quant) * d * (1.0 - beta * np.log(1.0 + 0.5*(i+j)) / np.log(N))
 
+@register_phase('hybrid_blend')
 def phase_hybrid_blend(i, j, d, N, n_quant=25.0, beta=1.0, gamma=0.8):
     # BLENDED: Smooth inversion with reciprocal term
     avg = 0.5*(i + j)
@@ -82,6 +123,7 @@ def phase_hybrid_blend(i, j, d, N, n_quant=25.0, beta=1.0, gamma=0.8):
                                     + gamma / (1.0 + avg))
 
 # NEW: Position-dependent amplitude modulation
+@register_amplitude('position')
 def amplitude_modulation(i, j, N, alpha=0.0):
     """Modulate Pascal amplitude by position to create curvature"""
     if alpha == 0.0:
@@ -91,27 +133,53 @@ def amplitude_modulation(i, j, N, alpha=0.0):
     return 1.0 / (1.0 + alpha * avg / N)
 
 # ----- Build operator with a chosen phase kernel -----
-def build_operator(N, max_distance, phase_fn, phase_kwargs=None, taper_eps=0.0, amp_alpha=0.0):
+def operator_diagonals(N, max_distance, phase_fn, phase_kwargs=None, taper_eps=0.0, amp_alpha=0.0,
+                       amp_fn='position'):
+    """
+    Nonzero diagonals of the hop operator as (offsets, data) in
+    scipy.sparse.diags convention. phase_fn / amp_fn are registered kernel
+    names or callables; each is called once per diagonal with index arrays.
+    H[i, j] = -amp·e^{+iφ(i,j,d)} above the diagonal and -amp·e^{-iφ(i,j,d)}
+    below it (φ evaluated at that element).
+    """
     if phase_kwargs is None: phase_kwargs = {}
-    H = np.zeros((N, N), dtype=complex)
+    phase_fn = _resolve(phase_fn, PHASE_KERNELS, 'phase')
+    amp_fn = _resolve(amp_fn, AMP_KERNELS, 'amplitude')
+    if 'N' in phase_fn.__code__.co_varnames:
+        phase_kwargs = dict(phase_kwargs, N=N)
     taper = edge_taper_vec(N, eps=taper_eps, sigma=6.0)
 
-    for i in range(N):
-        jmin, jmax = max(0, i-max_distance), min(N, i+max_distance+1)
-        for j in range(jmin, jmax):
-            if i == j: continue
-            d = abs(j - i)
-            if d == 0 or d > max_distance: continue
+    offsets, data = [], []
+    for d in range(1, min(max_distance, N - 1) + 1):
+        lo = np.arange(N - d)
+        hi = lo + d
+        w = np.sqrt(taper[lo] * taper[hi])
+        for i, j, sign, k in ((lo, hi, 1j, d), (hi, lo, -1j, -d)):
             amp = pascal_amp(d)
-            
-            # Apply position-dependent amplitude modulation
             if amp_alpha != 0.0:
-                amp *= amplitude_modulation(i, j, N, amp_alpha)
-            
-            phi = phase_fn(i, j, d, N=N, **phase_kwargs) if 'N' in phase_fn.__code__.co_varnames else phase_fn(i, j, d, **phase_kwargs)
-            hop = -amp * (np.exp(1j*phi) if j > i else np.exp(-1j*phi))
-            hop *= np.sqrt(taper[i]*taper[j])
-            H[i, j] = hop
+                amp = amp * amp_fn(i, j, N, amp_alpha)
+            phi = phase_fn(i, j, d, **phase_kwargs)
+            offsets.append(k)
+            data.append(-amp * np.exp(sign * phi) * w)
+    return offsets, data
+
+def build_operator(N, max_distance, phase_fn, phase_kwargs=None, taper_eps=0.0, amp_alpha=0.0,
+                   amp_fn='position', format='dense'):
+    """
+    Hop operator from operator_diagonals. format='dense' gives the N×N array;
+    'dia'/'csr'/... a scipy.sparse matrix; 'operator' a matrix-free LinearOperator.
+    """
+    offsets, data = operator_diagonals(N, max_distance, phase_fn, phase_kwargs,
+                                       taper_eps, amp_alpha, amp_fn)
+    if format == 'operator':
+        return diagonals_operator(offsets, data, N)
+    if format != 'dense':
+        from scipy.sparse import diags
+        return diags(data, offsets, shape=(N, N), format=format, dtype=complex)
+    H = np.zeros((N, N), dtype=complex)
+    for k, v in zip(offsets, data):
+        i = np.arange(len(v)) + max(-k, 0)
+        H[i, i + k] = v
     return H
 
 # ----- Fit & metrics -----
@@ -122,24 +190,7 @@ def affine_fit(model_vals, target):
     return a, b, aligned
 
 def stats(evals, zeros):
-    ev = np.sort(evals)[:len(zeros)]
-    a, b, aligned = affine_fit(ev, zeros)
-    res = aligned - zeros
-    idx = np.arange(len(res))
-    quad = np.polyfit(idx, res, 2)
-    rmse = float(np.sqrt(np.mean(res**2)))
-    mape = float(np.mean(np.abs(res)/zeros)*100.0)
-    sp_m = np.diff(aligned); sp_m /= np.mean(sp_m)
-    sp_t = np.diff(zeros);   sp_t /= np.mean(sp_t)
-    corr = float(np.corrcoef(sp_m, sp_t)[0,1])
-    hi = np.percentile(np.r_[sp_m, sp_t], 99)
-    h1, edges = np.histogram(sp_m, bins=30, range=(0,hi), density=True)
-    h2, _     = np.histogram(sp_t, bins=edges, density=True)
-    F1, F2 = np.cumsum(h1), np.cumsum(h2)
-    if F1[-1] != 0: F1 /= F1[-1]
-    if F2[-1] != 0: F2 /= F2[-1]
-    ks = float(np.max(np.abs(F1 - F2)))
-    return dict(a=a,b=b,aligned=aligned,res=res,quad=quad,rmse=rmse,mape=mape,corr=corr,ks=ks)
+    return row(batch_metrics(evals, zeros))
 
 def plots(tag, info, zeros):
     aligned, res, quad = info['aligned'], info['res'], info['quad']
@@ -200,11 +251,15 @@ def run_all():
         ("prime_amp1.0",         phase_prime_sum,   dict(),             1.0),
     ]
 
+    spectra = np.stack([
+        np.linalg.eigvalsh(build_operator(N, dmax, fn, phase_kwargs=kw,
+                                          taper_eps=taper_eps, amp_alpha=amp_alpha))
+        for _, fn, kw, amp_alpha in configs])
+    batch = batch_metrics(spectra, zeros)   # all configs scored in one pass
+
     best = None
-    for name, fn, kw, amp_alpha in configs:
-        H = build_operator(N, dmax, fn, phase_kwargs=kw, taper_eps=taper_eps, amp_alpha=amp_alpha)
-        ev = np.linalg.eigvalsh(H)
-        info = stats(ev, zeros)
+    for i, (name, fn, kw, amp_alpha) in enumerate(configs):
+        info = row(batch, i)
         print(f"\n[{name}]  MAPE={info['mape']:.2f}%  RMSE={info['rmse']:.2f}  "
               f"quad.a={info['quad'][0]:+.4f}  corr={info['corr']:.3f}  KS={info['ks']:.3f}")
         plots(name, info, zeros)
@@ -0,0 +1,181 @@
+# hp_lattice.py
+# Shared Pascal/Berry-phase lattice Hamiltonian for the N-sweep scripts.
+# All 2·d_max hops are computed as arrays in one pass (no Python double loop).
+
+import numpy as np
+from math import comb
+from scipy.linalg import eig_banded, eigh
+
+TWIST_MODES = ('uniform', 'sublattice', 'center', 'ramp')
+
+# ——— PASCAL AMPLITUDE ———
+def pascal_amp(d, d_max=5):
+    """sqrt(C(d, d//2)) / 2^d for 0 <= d <= 2*d_max, zero outside. Accepts arrays."""
+    table = np.array([np.sqrt(comb(k, k // 2)) / (2 ** k) for k in range(2 * d_max + 1)])
+    d = np.asarray(d)
+    inside = (d >= 0) & (d <= 2 * d_max)
+    return np.where(inside, table[np.clip(d, 0, 2 * d_max)], 0.0)
+
+# ——— CHIRALITY FACTORS ———
+def chirality(N, twist_mode='uniform'):
+    """
+    Per-site chirality s_i for the Berry phase.
+    - 'uniform': all sites +1 (original behavior)
+    - 'sublattice': alternating (+1,-1,+1,-1,...) staggered
+    - 'center': flip at midpoint (left +, right -)
+    - 'ramp': smooth continuous chirality from -1 to +1
+    Unknown modes fall back to 'uniform'.
+    """
+    i = np.arange(N)
+    if twist_mode == 'sublattice':
+        return np.where(i % 2 == 0, 1.0, -1.0)
+    if twist_mode == 'center':
+        return np.where(i <= (N - 1) / 2.0, 1.0, -1.0)
+    if twist_mode == 'ramp':
+        return (2 * i - (N - 1)) / N
+    return np.ones(N)
+
+# ——— HOPPING TABLE ———
+def hamiltonian_hops(N, d_max, alpha, p, n_flux, twist_mode='uniform'):
+    """
+    Raw (pre-Hermitization) hops as an (N, 2*d_max+1) array.
+
+    Column dj + d_max holds H[i, (i+dj) % N]; the dj = 0 column is zero.
+    Also returns the wrapped column index array J of the same shape.
+    """
+    i = np.arange(N)[:, None]
+    dj = np.arange(-d_max, d_max + 1)[None, :]
+    J = (i + dj) % N
+    d = np.abs(i - J)
+
+    A = pascal_amp(d, d_max)
+    u = (i + J) / (2.0 * N)
+    decay = 1.0 / (1.0 + alpha * u**p)
+    s = chirality(N, twist_mode)[:, None]
+    phase = np.exp(1j * s * (2 * np.pi / n_flux) * dj)
+
+    hops = -A * decay * phase
+    hops[d == 0] = 0.0
+    return hops, J
+
+# ——— BUILD HAMILTONIAN ———
+def build_hamiltonian(N, d_max, alpha, p, n_flux, twist_mode='uniform'):
+    """Dense Hermitian H; drop-in replacement for the per-script loop builders."""
+    hops, J = hamiltonian_hops(N, d_max, alpha, p, n_flux, twist_mode)
+    I = np.broadcast_to(np.arange(N)[:, None], J.shape)
+    keep = J != I
+
+    H = np.zeros((N, N), dtype=complex)
+    H[I[keep], J[keep]] = hops[keep]   # row-major, same write order as the loop
+    H = (H + H.conj().T) / 2.0
+    return H
+
+# ——— BANDED STORAGE ———
+def hamiltonian_band(N, d_max, alpha, p, n_flux, twist_mode='uniform'):
+    """
+    Hermitized H in upper banded form (scipy.linalg.eig_banded layout):
+    band[d_max + i - j, j] == H[i, j] for 0 <= j - i <= d_max.
+
+    The periodic wrap hops have d >= N - d_max, where pascal_amp vanishes
+    once N > 3*d_max, so H is strictly banded there.
+    """
+    if N <= 3 * d_max:
+        raise ValueError(f"N={N} too small for banded storage (need N > {3 * d_max})")
+    hops, _ = hamiltonian_hops(N, d_max, alpha, p, n_flux, twist_mode)
+    band = np.zeros((d_max + 1, N), dtype=complex)
+    for k in range(1, d_max + 1):
+        upper = hops[:N - k, d_max + k]     # H[i, i+k]
+        lower = hops[k:, d_max - k]         # H[i+k, i]
+        band[d_max - k, k:] = (upper + lower.conj()) / 2.0
+    return band
+
+# ——— MIDDLE-BAND SPECTRUM ———
+def middle_band(N, d_max, alpha, p, n_flux, twist_mode='uniform', method='banded'):
+    """
+    Sorted eigenvalues evals[N//3 : 2*N//3] of H, i.e. the window every
+    sweep keeps after a full eigh. Only that index range is computed.
+
+    method: 'banded' (eig_banded, O(N·d_max) memory) or 'dense'
+    (eigh with subset_by_index). Small N always goes dense.
+    """
+    lo, hi = N // 3, 2 * N // 3 - 1
+    if hi < lo:
+        return np.empty(0)
+    if method == 'banded' and N > 3 * d_max:
+        band = hamiltonian_band(N, d_max, alpha, p, n_flux, twist_mode)
+        return eig_banded(band, eigvals_only=True, select='i', select_range=(lo, hi))
+    if method not in ('banded', 'dense'):
+        raise ValueError(f"unknown method {method!r}")
+    H = build_hamiltonian(N, d_max, alpha, p, n_flux, twist_mode)
+    return eigh(H, eigvals_only=True, subset_by_index=[lo, hi])
+
+# ——— DIAGONAL STORAGE ———
+def hamiltonian_diagonals(N, d_max, alpha, p, n_flux, twist_mode='uniform'):
+    """
+    Nonzero diagonals of the Hermitized H (N > 3*d_max) in scipy.sparse.diags
+    convention: offsets [1..d_max, -1..-d_max], data[m][i] = H[i, i+k] for
+    k >= 0 and H[i-k, i] for k < 0. O(N·d_max) memory.
+    """
+    band = hamiltonian_band(N, d_max, alpha, p, n_flux, twist_mode)
+    upper = [band[d_max - k, k:] for k in range(1, d_max + 1)]
+    offsets = list(range(1, d_max + 1)) + [-k for k in range(1, d_max + 1)]
+    return offsets, upper + [u.conj() for u in upper]
+
+def _diagonals_matmat(offsets, data, N, dtype):
+    """Y = sum_k diag(data_k, offsets_k) @ X for 1-D or 2-D X."""
+    def matmat(X):
+        X = np.asarray(X)
+        Y = np.zeros((N,) + X.shape[1:], dtype=np.result_type(dtype, X.dtype))
+        for k, v in zip(offsets, data):
+            v = v.reshape((-1,) + (1,) * (X.ndim - 1))
+            if k >= 0:
+                Y[:N - k] += v * X[k:]
+            else:
+                Y[-k:] += v * X[:N + k]
+        return Y
+    return matmat
+
+def diagonals_operator(offsets, data, N):
+    """
+    Matrix-free scipy LinearOperator for sum_k diag(data_k, offsets_k).
+    matvec/matmat (and the adjoint, diagonals at -offsets conjugated) cost
+    O(N·len(offsets)); nothing N×N is ever formed, so eigsh/lobpcg can pull
+    extreme eigenvalues of very large lattices.
+    """
+    from scipy.sparse.linalg import LinearOperator
+    dtype = np.result_type(*data)
+    matmat = _diagonals_matmat(offsets, data, N, dtype)
+    rmatmat = _diagonals_matmat([-k for k in offsets], [v.conj() for v in data], N, dtype)
+    return LinearOperator((N, N), matvec=matmat, matmat=matmat,
+                          rmatvec=rmatmat, rmatmat=rmatmat, dtype=dtype)
+
+def hamiltonian_operator(N, d_max, alpha, p, n_flux, twist_mode='uniform'):
+    """
+    H as a matrix-free LinearOperator, e.g.
+    eigsh(hamiltonian_operator(N, ...), k=40, which='SA') at N ~ 1e6.
+    """
+    offsets, data = hamiltonian_diagonals(N, d_max, alpha, p, n_flux, twist_mode)
+    return diagonals_operator(offsets, data, N)
+
+# ——— SPARSE STORAGE ———
+def hamiltonian_sparse(N, d_max, alpha, p, n_flux, twist_mode='uniform', format='csr'):
+    """Hermitized H as a scipy.sparse matrix ('csr', 'dia', ...) built from the band (N > 3*d_max)."""
+    from scipy.sparse import diags
+    offsets, data = hamiltonian_diagonals(N, d_max, alpha, p, n_flux, twist_mode)
+    return diags(data, offsets, shape=(N, N), format=format)
+
+# ——— SELF-CHECK ———
+def check(N=200, d_max=5, alpha=0.5, p=1.0, n_flux=1, twist_mode='uniform', seed=0):
+    """hamiltonian_operator and its adjoint agree with hamiltonian_sparse on 1-D and 2-D input."""
+    op = hamiltonian_operator(N, d_max, alpha, p, n_flux, twist_mode)
+    H = hamiltonian_sparse(N, d_max, alpha, p, n_flux, twist_mode)
+    rng = np.random.default_rng(seed)
+    for x in (rng.standard_normal(N) + 1j * rng.standard_normal(N),
+              rng.standard_normal((N, 3)) + 1j * rng.standard_normal((N, 3))):
+        assert np.allclose(op @ x, H @ x)
+        assert np.allclose(op.H @ x, H.conj().T @ x)
+    assert np.allclose(op.rmatvec(x[:, 0]), H.conj().T @ x[:, 0])
+
+if __name__ == "__main__":
+    check()
+    print("hp_lattice operator check passed")
@@ -0,0 +1,91 @@
+# hp_metrics.py
+# Batched spectrum-vs-zeros scoring. One vectorized call scores a whole stack
+# of candidate spectra (n_configs, K) against the Riemann zeros: affine map
+# (a, b), RMSE, MAPE, quadratic residual drift, spacing correlation and the
+# spacing-CDF KS statistic — the same numbers hp_geo_phase.stats and
+# hp_geo_amp_validate.metrics produce one spectrum at a time.
+
+import numpy as np
+
+# ——— AFFINE FIT ———
+def batch_affine(X, Y, n_fit=None):
+    """
+    Least-squares Y ≈ a·X + b per row, fitted on the first n_fit columns.
+    X is (n, K); Y is (K,) or (n, K). Returns a, b of shape (n,).
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.broadcast_to(np.asarray(Y, dtype=float), X.shape)
+    if n_fit is not None:
+        X, Y = X[:, :n_fit], Y[:, :n_fit]
+    xm = X.mean(axis=1, keepdims=True)
+    ym = Y.mean(axis=1, keepdims=True)
+    dx = X - xm
+    a = np.sum(dx * (Y - ym), axis=1) / np.sum(dx * dx, axis=1)
+    b = ym[:, 0] - a * xm[:, 0]
+    return a, b
+
+# ——— SPACINGS ———
+def _unit_spacings(V):
+    s = np.diff(V, axis=1)
+    return s / s.mean(axis=1, keepdims=True)
+
+def _row_corr(A, B):
+    A = A - A.mean(axis=1, keepdims=True)
+    B = B - B.mean(axis=1, keepdims=True)
+    return np.sum(A * B, axis=1) / np.sqrt(np.sum(A * A, axis=1) * np.sum(B * B, axis=1))
+
+def _row_hist(S, hi, bins):
+    """Per-row counts on [0, hi_row] with `bins` equal bins (np.histogram edge rules)."""
+    n = S.shape[0]
+    idx = np.floor(S / hi[:, None] * bins).astype(int)
+    idx[S == hi[:, None]] = bins - 1            # right edge belongs to the last bin
+    inside = (S >= 0) & (S <= hi[:, None])
+    flat = (np.arange(n)[:, None] * bins + np.clip(idx, 0, bins - 1))[inside]
+    return np.bincount(flat, minlength=n * bins).reshape(n, bins)
+
+def batch_ks(sp_m, sp_t, bins=30, pct=99):
+    """KS distance between binned spacing CDFs, per row (30 bins up to the 99th pct)."""
+    sp_t = np.broadcast_to(sp_t, sp_m.shape)
+    hi = np.percentile(np.concatenate([sp_m, sp_t], axis=1), pct, axis=1)
+    F1 = np.cumsum(_row_hist(sp_m, hi, bins), axis=1).astype(float)
+    F2 = np.cumsum(_row_hist(sp_t, hi, bins), axis=1).astype(float)
+    F1 /= np.where(F1[:, -1:] != 0, F1[:, -1:], 1.0)
+    F2 /= np.where(F2[:, -1:] != 0, F2[:, -1:], 1.0)
+    return np.max(np.abs(F1 - F2), axis=1)
+
+# ——— FULL METRICS ———
+def batch_metrics(spectra, zeros, sort=True, n_fit=None):
+    """
+    Score every row of `spectra` (n_configs, M >= K) against `zeros` (K,).
+
+    Rows are sorted and cut to the K lowest values (sort=False takes the first
+    K as given). The affine map is fitted on the first n_fit levels (default
+    all K) and every metric is then computed over all K. Returns a dict of
+    arrays: a, b, rmse, mape, quad (n, 3; highest power first, like polyfit),
+    corr, ks, plus aligned and res of shape (n, K).
+    """
+    zeros = np.asarray(zeros, dtype=float)
+    K = len(zeros)
+    S = np.atleast_2d(np.asarray(spectra, dtype=float))
+    S = (np.sort(S, axis=1) if sort else S)[:, :K]
+
+    a, b = batch_affine(S, zeros, n_fit)
+    aligned = a[:, None] * S + b[:, None]
+    res = aligned - zeros
+
+    V = np.vander(np.arange(K, dtype=float), 3)             # same basis as np.polyfit(.., 2)
+    quad = np.linalg.lstsq(V, res.T, rcond=None)[0].T
+
+    sp_m = _unit_spacings(aligned)
+    sp_t = _unit_spacings(zeros[None, :])
+    return dict(
+        a=a, b=b, aligned=aligned, res=res, quad=quad,
+        rmse=np.sqrt(np.mean(res**2, axis=1)),
+        mape=np.mean(np.abs(res) / zeros, axis=1) * 100.0,
+        corr=_row_corr(sp_m, np.broadcast_to(sp_t, sp_m.shape)),
+        ks=batch_ks(sp_m, sp_t),
+    )
+
+def row(metrics, i=0):
+    """Pull config i out of a batch_metrics dict as plain floats/arrays."""
+    return {k: (float(v[i]) if np.ndim(v) == 1 else v[i]) for k, v in metrics.items()}
@@ -0,0 +1,195 @@
+# hp_sweep.py
+# Parallel (mode, N) sweep runner for the lattice-size scans.
+# Each point is independent: fan out over a process pool, one BLAS thread per
+# worker, stream every finished row to CSV, and resume from that CSV on rerun.
+# BLAS reads its thread count only when it loads, so workers are spawned
+# (fresh interpreters) with the *_NUM_THREADS variables set by the parent;
+# calling scripts must therefore guard their sweep with __name__ == "__main__".
+# Every row carries the lattice / fit parameters and a digest of the zeros it
+# was scored on, so a resumed sweep only reuses rows computed with the same
+# settings; points with too few eigenvalues are recorded with Status=skipped.
+
+import os
+import csv
+import inspect
+import hashlib
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from hp_lattice import middle_band
+from hp_metrics import batch_affine
+
+BLAS_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+COLUMNS = ['Mode', 'N', 'Train_MAPE', 'Valid_MAPE', 'Extended_MAPE', 'Total_Drift',
+           'Coef_a', 'Coef_b', 'Drift_First5', 'Drift_Middle14', 'Drift_Last5',
+           'Drift_Q1', 'Drift_Q2', 'Drift_Q3', 'Drift_Q4',
+           'Eigenval_Min', 'Eigenval_Max', 'Num_Eigenvals',
+           'd_max', 'alpha', 'p', 'n_flux', 'n_train', 'n_valid', 'K', 'Zeros_SHA1', 'Status']
+PARAM_COLUMNS = ['d_max', 'alpha', 'p', 'n_flux', 'n_train', 'n_valid', 'K', 'Zeros_SHA1']
+
+# ——— ONE SWEEP POINT ———
+def evaluate_point(mode, N, zeros, d_max=5, alpha=0.7, p=1.5, n_flux=25,
+                   n_train=30, n_valid=28):
+    """
+    Middle-band spectrum of one lattice, affine-fitted on the first n_train
+    zeros and scored on the next n_valid (validation) and the rest (extended).
+    Returns a result row, or None if the band holds fewer than len(zeros) levels.
+    """
+    zeros = np.asarray(zeros, dtype=float)
+    K = len(zeros)
+    n_evals = 2 * N // 3 - N // 3
+    if n_evals < K:
+        return None
+
+    model_evals = middle_band(N, d_max, alpha, p, n_flux, twist_mode=mode)
+    train, valid, extended = np.split(zeros, [n_train, n_train + n_valid])
+
+    (a,), (b,) = batch_affine(model_evals[None, :K], zeros, n_fit=n_train)
+    pred = a * model_evals[:K] + b
+    pred_train, pred_valid, pred_extended = np.split(pred, [n_train, n_train + n_valid])
+
+    def mape(true, est):
+        return np.mean(np.abs((true - est) / true)) * 100 if len(true) else np.nan
+
+    res = pred_valid - valid
+    q1, q2, q3, q4 = np.array_split(res, 4)
+    return {
+        'Mode': mode,
+        'N': N,
+        'Train_MAPE': mape(train, pred_train),
+        'Valid_MAPE': mape(valid, pred_valid),
+        'Extended_MAPE': mape(extended, pred_extended),
+        'Total_Drift': np.mean(res[-5:]) - np.mean(res[:5]),
+        'Coef_a': a,
+        'Coef_b': b,
+        'Drift_First5': np.mean(res[:5]),
+        'Drift_Middle14': np.mean(res[14:28]),
+        'Drift_Last5': np.mean(res[-5:]),
+        'Drift_Q1': np.mean(q1),
+        'Drift_Q2': np.mean(q2),
+        'Drift_Q3': np.mean(q3),
+        'Drift_Q4': np.mean(q4),
+        'Eigenval_Min': model_evals[0],
+        'Eigenval_Max': model_evals[-1],
+        'Num_Eigenvals': n_evals,
+    }
+
+# ——— WORKER SETUP ———
+@contextmanager
+def _blas_env(n_threads):
+    """Set the BLAS/OpenMP thread variables for processes started inside the block."""
+    old = {var: os.environ.get(var) for var in BLAS_ENV_VARS}
+    os.environ.update({var: str(n_threads) for var in BLAS_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, val in old.items():
+            if val is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = val
+
+def _evaluate(args):
+    mode, N, zeros, params = args
+    return mode, N, evaluate_point(mode, N, zeros, **params)
+
+# ——— RESUME KEYS ———
+def sweep_params(zeros, **params):
+    """evaluate_point's parameters (defaults filled in) plus the zero count and digest."""
+    sig = inspect.signature(evaluate_point)
+    full = {k: v.default for k, v in sig.parameters.items() if v.default is not inspect.Parameter.empty}
+    unknown = set(params) - set(full)
+    if unknown:
+        raise TypeError(f"unknown sweep parameters: {sorted(unknown)}")
+    full.update(params)
+    zeros = np.ascontiguousarray(zeros, dtype=float)
+    full['K'] = len(zeros)
+    full['Zeros_SHA1'] = hashlib.sha1(zeros.tobytes()).hexdigest()[:12]
+    return full
+
+def _key(mode, N, params):
+    vals = (params[c] if isinstance(params[c], str) else float(params[c]) for c in PARAM_COLUMNS)
+    return (mode, int(N)) + tuple(vals)
+
+# ——— SWEEP ———
+def run_sweep(modes, N_values, zeros, out_csv=None, max_workers=None, blas_threads=1,
+              verbose=True, **params):
+    """
+    Evaluate every (mode, N) point of modes × N_values in a process pool.
+
+    Finished rows are appended to out_csv as they arrive, together with the
+    parameters they were computed with; points already in out_csv with the
+    same parameters and zeros are skipped, so a crashed or interrupted sweep
+    resumes where it stopped. Rows from other parameter sets are left in the
+    file but never reused. Points with too few eigenvalues are written with
+    Status=skipped (and not retried). A CSV written without the parameter
+    columns is refused. Extra keyword params (d_max, alpha, p, n_flux, ...)
+    are passed to evaluate_point. Workers are spawned with blas_threads
+    BLAS threads each, so call this from under `if __name__ == "__main__":`.
+    Returns the computed rows as a DataFrame sorted by mode order, N.
+    """
+    params = sweep_params(zeros, **params)
+    done = pd.DataFrame(columns=COLUMNS)
+    if out_csv and os.path.exists(out_csv) and os.path.getsize(out_csv) > 0:
+        done = pd.read_csv(out_csv, float_precision='round_trip',
+                           dtype={'Zeros_SHA1': str, 'Status': str})
+        if list(done.columns) != COLUMNS:
+            raise ValueError(f"{out_csv} has columns {list(done.columns)}, not the current "
+                             f"sweep layout (parameter columns missing?); use a new out_csv")
+    records = {_key(r['Mode'], r['N'], r): r for r in done.to_dict('records')}
+
+    points = [(m, int(N)) for m in modes for N in N_values]
+    todo = [pt for pt in points if _key(*pt, params) not in records]
+    rows = [records[_key(*pt, params)] for pt in points if _key(*pt, params) in records]
+    if verbose and records:
+        print(f"Resuming: {len(rows)} matching points in {out_csv} "
+              f"({len(records) - len(rows)} rows with other parameters ignored), {len(todo)} to go")
+
+    if todo:
+        if max_workers is None:
+            max_workers = min(len(todo), os.cpu_count() or 1)
+        # spawn, not fork: a forked worker inherits the parent's already-loaded BLAS
+        ctx = multiprocessing.get_context('spawn')
+
+        f = open(out_csv, 'a', newline='') if out_csv else None
+        try:
+            writer = None
+            if f is not None:
+                writer = csv.DictWriter(f, fieldnames=COLUMNS)
+                if f.tell() == 0:
+                    writer.writeheader()
+            with _blas_env(blas_threads), \
+                    ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+                point_kw = {k: v for k, v in params.items() if k not in ('K', 'Zeros_SHA1')}
+                jobs = [pool.submit(_evaluate, (m, N, zeros, point_kw)) for m, N in todo]
+                for job in as_completed(jobs):
+                    mode, N, row = job.result()
+                    if row is None:
+                        row = dict(Mode=mode, N=N, **params, Status='skipped')
+                        if verbose:
+                            print(f"{mode} N={N}: not enough eigenvalues, skipped")
+                    else:
+                        row.update(params, Status='ok')
+                    rows.append(row)
+                    if writer is not None:
+                        writer.writerow(row)
+                        f.flush()
+                    if verbose and row['Status'] == 'ok':
+                        print(f"{mode:<11} N={N:<6} Valid MAPE={row['Valid_MAPE']:.3f}%  "
+                              f"Drift={row['Total_Drift']:+.4f}")
+        finally:
+            if f is not None:
+                f.close()
+
+    df = pd.DataFrame([r for r in rows if r['Status'] == 'ok'], columns=COLUMNS)
+    order = {m: k for k, m in enumerate(modes)}
+    df['_order'] = df['Mode'].map(order)
+    df = df.sort_values(['_order', 'N']).drop(columns='_order').reset_index(drop=True)
+    df['N'] = df['N'].astype(int)
+    return df
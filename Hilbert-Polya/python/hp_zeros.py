@@ -0,0 +1,238 @@
+# hp_zeros.py
+# Persistent on-disk store of Riemann zero ordinates t_k (zeta(1/2 + i t_k) = 0).
+# One compact .npz indexed by zero number: float64 values plus the full-precision
+# mpmath strings and the dps they were computed at. The store only ever grows:
+# asking for more zeros computes just the missing tail (k > cached max).
+#
+# Writers serialize on a lock file and publish with an atomic rename, so any
+# number of concurrent readers always see a complete, consistent file.
+# Large extensions are computed in parallel chunks that are checkpointed next
+# to the store, so an interrupted run picks up where it stopped.
+#
+#   python hp_zeros.py 20000 [dps] [workers]    # grow the store from the shell
+#
+# get_zeros(K, method='rs') is the bulk fast path: exact store values for the
+# low zeros, Riemann–Siegel float64 zeros (hp_riemann_siegel.py) beyond them,
+# with a sample cross-checked against mpmath. RS values are never written to
+# the store, which only holds full-precision zetazero output.
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:          # non-POSIX: single-writer assumption
+    fcntl = None
+
+DEFAULT_DPS = 50
+DEFAULT_CHUNK = 250          # zeros per worker task / checkpoint
+RS_EXACT_PREFIX = 100        # RS float64 error is ~1e-6..1e-9 below this index
+DEFAULT_STORE = os.environ.get(
+    'HP_ZERO_STORE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'riemann_zeros.npz'))
+
+# ——— READ ———
+def load_store(path=None):
+    """Return (t float64 array, mp string array, dps) for the store; empty if absent."""
+    path = path or DEFAULT_STORE
+    if not os.path.exists(path):
+        return np.empty(0), np.empty(0, dtype='U1'), 0
+    with np.load(path) as data:
+        return data['t'], data['mp'], int(data['dps'])
+
+def _save_store(path, t, mp_strs, dps):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        np.savez(f, t=np.asarray(t, dtype=np.float64), mp=np.asarray(mp_strs, dtype=str),
+                 dps=np.int64(dps))
+    os.replace(tmp, path)    # atomic: readers see the old or the new file, never half
+
+class _StoreLock:
+    """Exclusive writer lock on <store>.lock (no-op without fcntl)."""
+    def __init__(self, path):
+        self.path = path + '.lock'
+        self.f = None
+
+    def __enter__(self):
+        self.f = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+
+# ——— COMPUTE ———
+def compute_zeros(k_start, k_end, dps=DEFAULT_DPS):
+    """mp strings of t_k for k_start <= k <= k_end via mpmath.zetazero (serial)."""
+    from mpmath import mp, zetazero, nstr
+    old = mp.dps
+    mp.dps = dps
+    try:
+        return [nstr(zetazero(k).imag, dps) for k in range(k_start, k_end + 1)]
+    finally:
+        mp.dps = old
+
+# ——— PARALLEL COMPUTE WITH CHECKPOINTS ———
+def _chunk_dir(path):
+    return path + '.chunks'
+
+def _chunk_file(path, k0, k1, dps):
+    return os.path.join(_chunk_dir(path), f"{k0:09d}_{k1:09d}_dps{dps}.txt")
+
+def _read_chunk(fname):
+    with open(fname) as f:
+        return [line.strip() for line in f if line.strip()]
+
+def _write_chunk(fname, strs):
+    tmp = f"{fname}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        f.write('\n'.join(strs) + '\n')
+    os.replace(tmp, fname)
+
+def _compute_chunk(args):
+    k0, k1, dps = args
+    return k0, k1, compute_zeros(k0, k1, dps)   # mp.dps is set inside the worker
+
+def compute_zeros_parallel(k_start, k_end, dps=DEFAULT_DPS, path=None, workers=None,
+                           chunk=DEFAULT_CHUNK, verbose=True):
+    """
+    mp strings of t_k for k_start <= k <= k_end, split into chunks over a
+    process pool. Every finished chunk is checkpointed to <store>.chunks/, and
+    chunks already there (same dps) are reused, so an interrupted run resumes.
+    """
+    path = path or DEFAULT_STORE
+    os.makedirs(_chunk_dir(path), exist_ok=True)
+    bounds = [(k0, min(k0 + chunk - 1, k_end)) for k0 in range(k_start, k_end + 1, chunk)]
+
+    results, todo = {}, []
+    for k0, k1 in bounds:
+        fname = _chunk_file(path, k0, k1, dps)
+        if os.path.exists(fname):
+            results[k0] = _read_chunk(fname)
+        else:
+            todo.append((k0, k1, dps))
+    total = k_end - k_start + 1
+    done = sum(len(v) for v in results.values())
+    if verbose and results:
+        print(f"  resuming: {done}/{total} zeros found in checkpoints")
+
+    if todo:
+        workers = workers or os.cpu_count() or 1
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        t0 = time.time()
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx) as pool:
+            for job in as_completed([pool.submit(_compute_chunk, c) for c in todo]):
+                k0, k1, strs = job.result()
+                _write_chunk(_chunk_file(path, k0, k1, dps), strs)
+                results[k0] = strs
+                done += len(strs)
+                if verbose:
+                    el = time.time() - t0
+                    eta = el / max(done, 1) * (total - done)
+                    print(f"  zeros {k0}..{k1} done  [{done}/{total}]  "
+                          f"elapsed {el:.0f}s, eta {eta:.0f}s")
+
+    return [s for k0, _ in bounds for s in results[k0]]
+
+def _clear_chunks(path):
+    cdir = _chunk_dir(path)
+    if os.path.isdir(cdir):
+        for name in os.listdir(cdir):
+            os.remove(os.path.join(cdir, name))
+        os.rmdir(cdir)
+
+# ——— EXTEND ———
+def extend_store(K, dps=DEFAULT_DPS, path=None, verbose=True, workers=None,
+                 chunk=DEFAULT_CHUNK):
+    """
+    Make sure the store holds at least the first K zeros at >= dps digits.
+    Only the missing tail is computed; a store built at lower dps is redone.
+    Tails longer than two chunks go to compute_zeros_parallel (workers=1
+    forces the serial path).
+    """
+    path = path or DEFAULT_STORE
+    with _StoreLock(path):
+        t, mp_strs, have_dps = load_store(path)   # re-read under the lock
+        if have_dps < dps:
+            if verbose and len(t):
+                print(f"Zero store at dps={have_dps} < {dps}: recomputing {len(t)} zeros")
+            K = max(K, len(t))
+            t, mp_strs = np.empty(0), np.empty(0, dtype='U1')
+        else:
+            dps = have_dps
+        if len(t) >= K:
+            return t
+        k0 = len(t) + 1
+        if verbose:
+            print(f"Computing Riemann zeros {k0}..{K} (mpmath, dps={dps})...")
+        if workers == 1 or K - k0 + 1 < 2 * chunk:
+            new = compute_zeros(k0, K, dps)
+        else:
+            new = compute_zeros_parallel(k0, K, dps, path=path, workers=workers,
+                                         chunk=chunk, verbose=verbose)
+        mp_strs = np.concatenate([mp_strs.astype(str), np.array(new, dtype=str)])
+        t = np.concatenate([t, np.array([float(s) for s in new])])
+        _save_store(path, t, mp_strs, dps)
+        _clear_chunks(path)
+        if verbose:
+            print(f"Saved {len(t)} zeros to {path}")
+        return t
+
+# ——— PUBLIC ENTRY POINT ———
+def get_zeros(K, dps=DEFAULT_DPS, path=None, verbose=True, workers=None, method='mpmath',
+              rs_tol=1e-8):
+    """
+    First K zero ordinates t_1..t_K as float64.
+    method='mpmath': served from (and grown into) the store.
+    method='rs': store prefix + Riemann–Siegel tail, see _get_zeros_rs.
+    """
+    if method == 'rs':
+        return _get_zeros_rs(K, dps, path, verbose, workers, rs_tol)
+    if method != 'mpmath':
+        raise ValueError(f"unknown method {method!r}")
+    t, _, have_dps = load_store(path)
+    if len(t) < K or have_dps < dps:
+        t = extend_store(K, dps=dps, path=path, verbose=verbose, workers=workers)
+    return np.array(t[:K], dtype=float)
+
+def _get_zeros_rs(K, dps, path, verbose, workers, rs_tol):
+    """
+    Exact zeros for k <= max(RS_EXACT_PREFIX, stored count), Riemann–Siegel
+    beyond that. Raises if a sampled cross-check against zetazero exceeds rs_tol.
+    """
+    from hp_riemann_siegel import rs_zeros, cross_check
+    n_exact = min(K, max(RS_EXACT_PREFIX, len(load_store(path)[0])))
+    head = get_zeros(n_exact, dps=dps, path=path, verbose=verbose, workers=workers)
+    if K == n_exact:
+        return head
+    if verbose:
+        print(f"Riemann–Siegel zeros {n_exact + 1}..{K} (float64)...")
+    tail = rs_zeros(K)[n_exact:]
+    err, ok = cross_check(tail, k_offset=n_exact + 1, tol=rs_tol, verbose=verbose)
+    if not ok:
+        raise RuntimeError(f"Riemann–Siegel zeros off by {err:.2e} > rs_tol={rs_tol:.0e}")
+    return np.concatenate([head, tail])
+
+def get_zeros_mp(K, dps=DEFAULT_DPS, path=None, verbose=True, workers=None):
+    """First K ordinates as full-precision mpmath strings (dps digits or better)."""
+    _, mp_strs, have_dps = load_store(path)
+    if len(mp_strs) < K or have_dps < dps:
+        extend_store(K, dps=dps, path=path, verbose=verbose, workers=workers)
+        _, mp_strs, _ = load_store(path)
+    return [str(s) for s in mp_strs[:K]]
+
+if __name__ == "__main__":
+    import sys
+    K = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    dps = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DPS
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    t = get_zeros(K, dps=dps, workers=workers)
+    print(f"t_1 = {t[0]:.12f}, t_{K} = {t[-1]:.12f}")
@@ -1,9 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from mpmath import zetazero
+from hp_zeros import get_zeros
 
 K = 50
-gam = np.array([float(zetazero(i+1).imag) for i in range(1, K+1)])
+gam = get_zeros(K+1)[1:]   # zeros 2..K+1, as before (zetazero(i+1) for i=1..K)
 
 # From final fit
 theta, L, a, b = 1.5707963268, 22.0, 0.4999999999, 10.0
@@ -2,56 +2,22 @@
 # Test N from 300 to 350 to see if drift normalizes
 
 import numpy as np
-from scipy.linalg import eigh
-from mpmath import zetazero, mp
-from math import comb
+from hp_zeros import get_zeros
+from hp_lattice import middle_band
 import pandas as pd
 
-mp.dps = 50
-
 # ——— FIXED PARAMETERS ———
 d_max = 5
 alpha = 0.7
 p = 1.5
 n_flux = 25
 
-# ——— RIEMANN ZEROS ———
-def get_zeros(K):
-    return np.array([float(zetazero(k+1).imag) for k in range(K)], dtype=float)
-
+# ——— RIEMANN ZEROS (cached on disk by hp_zeros.py, dps=50) ———
 zeros = get_zeros(73)
 train_zeros = zeros[:30]
 valid_zeros = zeros[30:58]
 extended_zeros = zeros[58:73]
 
-# ——— PASCAL AMPLITUDE ———
-def pascal_amp(d):
-    if d < 0 or d > 2 * d_max: return 0.0
-    k = d // 2
-    return np.sqrt(comb(d, k)) / (2 ** d)
-
-# ——— BUILD HAMILTONIAN ———
-def build_hamiltonian(N, d_max, alpha, p, n_flux):
-    H = np.zeros((N, N), dtype=complex)
-    phase_per_hop = 2 * np.pi / n_flux
-
-    for i in range(N):
-        for dj in range(-d_max, d_max + 1):
-            j = (i + dj) % N
-            if j < 0 or j >= N: continue
-            d = abs(i - j)
-            if d == 0: continue
-
-            A = pascal_amp(d)
-            u = (i + j) / (2.0 * N)
-            decay = 1.0 / (1.0 + alpha * u**p)
-            phase = np.exp(1j * phase_per_hop * dj)
-
-            H[i, j] = -A * decay * phase
-
-    H = (H + H.conj().T) / 2.0
-    return H
-
 # ——— TEST N = 300 to 350 ———
 N_values = list(range(300, 351, 5))  # 300, 305, 310, ..., 350
 results = []
@@ -63,11 +29,7 @@ print(f"{'N':<6} {'Train MAPE':<12} {'Valid MAPE':<12} {'Extend MAPE':<12} {'Coe
 print("-"*80)
 
 for N in N_values:
-    # Build and diagonalize
-    H = build_hamiltonian(N, d_max, alpha, p, n_flux)
-    evals = eigh(H, eigvals_only=True)
-    
-    # Extract middle band
+    # Middle band only (banded solver, no dense H)
     start_idx = N // 3
     end_idx = 2 * N // 3
     n_evals = end_idx - start_idx
@@ -76,7 +38,7 @@ for N in N_values:
         print(f"N={N}: Not enough eigenvalues ({n_evals}), skipping...")
         continue
     
-    model_evals = np.sort(evals[start_idx:end_idx])
+    model_evals = middle_band(N, d_max, alpha, p, n_flux)
     
     # Affine fit on training data
     X = np.vstack([model_evals[:30], np.ones(30)]).T
@@ -16,6 +16,8 @@ Date: November 2025
 Version: 1.1 (GOE/GUE Split)
 """
 
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -23,6 +25,9 @@ from scipy.optimize import curve_fit
 from scipy.stats import t as student_t
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sage.alpha_s import M_Z, M_TOP, M_BOTTOM, M_CHARM, alpha_s_with_thresholds
+
 print("="*80)
 print("TFFT-QCD: GOE vs GUE COMPARISON")
 print("="*80)
@@ -66,10 +71,6 @@ N_POINTS = len(data)
 print(f"  ✓ {N_POINTS} αₛ measurements loaded")
 
 # Constants
-M_Z = 91.1876
-M_TOP = 173.0
-M_BOTTOM = 4.18
-M_CHARM = 1.27
 E_PLANCK = 1.2209e19
 PI = np.pi
 
@@ -81,45 +82,6 @@ print("\n" + "="*80)
 print("REFERENCE: Standard Model QCD (2-Loop)")
 print("="*80)
 
-def beta_0(n_f):
-    return (11.0 - 2.0*n_f/3.0) / (4.0*PI)
-
-def beta_1(n_f):
-    return (102.0 - 38.0*n_f/3.0) / (16.0*PI**2)
-
-def alpha_s_2loop_rg(Q, alpha_ref, Q_ref, n_f):
-    b0 = beta_0(n_f)
-    b1 = beta_1(n_f)
-    L = np.log(Q / Q_ref)
-    denom = 1.0 + alpha_ref * b0 * L
-    if abs(denom) < 1e-10:
-        return alpha_ref
-    alpha_1loop = alpha_ref / denom
-    correction_factor = 1.0 - (b1 / b0) * alpha_ref * L / denom
-    return alpha_1loop * correction_factor
-
-def alpha_s_with_thresholds(Q, alpha_s_Z, Q_Z=M_Z):
-    alpha_current = alpha_s_Z
-    Q_current = Q_Z
-    
-    if Q > Q_current:
-        if Q > M_TOP:
-            alpha_current = alpha_s_2loop_rg(M_TOP, alpha_current, Q_current, n_f=5)
-            Q_current = M_TOP
-            return alpha_s_2loop_rg(Q, alpha_current, Q_current, n_f=6)
-        else:
-            return alpha_s_2loop_rg(Q, alpha_current, Q_current, n_f=5)
-    else:
-        if Q < M_CHARM:
-            alpha_at_mb = alpha_s_2loop_rg(M_BOTTOM, alpha_current, Q_current, n_f=5)
-            alpha_at_mc = alpha_s_2loop_rg(M_CHARM, alpha_at_mb, M_BOTTOM, n_f=4)
-            return alpha_s_2loop_rg(Q, alpha_at_mc, M_CHARM, n_f=3)
-        elif Q < M_BOTTOM:
-            alpha_at_mb = alpha_s_2loop_rg(M_BOTTOM, alpha_current, Q_current, n_f=5)
-            return alpha_s_2loop_rg(Q, alpha_at_mb, M_BOTTOM, n_f=4)
-        else:
-            return alpha_s_2loop_rg(Q, alpha_current, Q_current, n_f=5)
-
 def qcd_model_vectorized(Q_array, alpha_s_Z):
     return np.array([alpha_s_with_thresholds(Q, alpha_s_Z) for Q in Q_array])
 
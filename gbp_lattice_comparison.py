@@ -42,15 +42,11 @@ from scipy.optimize import curve_fit
 # ══════════════════════════════════════════════════════════════════════════
 
 PI        = math.pi
-PHI       = (1 + math.sqrt(5)) / 2
-GEO_B     = math.sin(PI / 15) ** 2        # = sin²(12°) = 0.043227
-ALPHA_IR  = 0.848809                       # GBP IR fixed point (Deur 2024)
-LU        = GEO_B / ALPHA_IR              # = 0.050927 — fundamental unit
-LAMBDA_QCD_MEV = 217.0                    # MS-bar 5-flavor [PDG]
+from sage.constants import PHI, GEO_B, ALPHA_IR, LU   # GEO_B = sin²(12°), LU = GEO_B/α_IR
+from sage.constants import LAMBDA_QCD as LAMBDA_QCD_MEV
+from sage.lanes import Z30_STAR, MIRROR_PAIRS, P, lat_weight
 LAMBDA_QCD_GEV = LAMBDA_QCD_MEV / 1000.0
 
-Z30_STAR  = [1, 7, 11, 13, 17, 19, 23, 29]   # coprime residues mod 30
-MIRROR_PAIRS = [(1, 29), (7, 23), (11, 19), (13, 17)]
 QUARK_LABELS = {
     (1, 29):  'colorless / vacuum',
     (7, 23):  'strange & charm',
@@ -58,14 +54,6 @@ QUARK_LABELS = {
     (13, 17): 'bottom & top',
 }
 
-def P(r):
-    """GBP projection weight for lane r."""
-    return math.sin(r * PI / 15) ** 2
-
-def lat_weight(r, N=30):
-    """Standard lattice QCD mode weight: sin²(πr/N)."""
-    return math.sin(r * PI / N) ** 2
-
 # ══════════════════════════════════════════════════════════════════════════
 # SECTION 1 — ILGENFRITZ DATA ENTRY
 # ══════════════════════════════════════════════════════════════════════════
@@ -31,26 +31,10 @@ import matplotlib.gridspec as gridspec
 
 PI = math.pi
 
-# ── Constants (Appendix A) ────────────────────────────────────────────────
-LAMBDA_QCD_MEV = 217.0          # PDG 2024, MS-bar 5-flavor
-ALPHA_IR       = 0.848809       # Deur et al. 2024
-GEO_B          = math.sin(PI/15)**2   # sin²(π/15) = 0.043227...
-LU             = GEO_B / ALPHA_IR    # = 0.050927...
-DELTA_MEV      = ALPHA_IR * LAMBDA_QCD_MEV  # mass gap = 184.2 MeV
-PHI            = (1 + math.sqrt(5)) / 2
-
-Z30_STAR = [1, 7, 11, 13, 17, 19, 23, 29]
-MIRROR_PAIRS = [(1,29), (7,23), (11,19), (13,17)]
-PAIR_LABELS  = {
-    (1,29):  'colorless / vacuum',
-    (7,23):  'strange & charm',
-    (11,19): 'up & down',
-    (13,17): 'bottom & top',
-}
-
-def P(r):   return math.sin(r * PI / 15)**2
-def W(r,N): return math.sin(r * PI / N)**2
-def improvement(r): return 4 * math.cos(r * PI / 30)**2
+# ── Constants (Appendix A) and Z30* lane weights: see sage/ ───────────────
+from sage.constants import LAMBDA_QCD as LAMBDA_QCD_MEV, ALPHA_IR, GEO_B, LU, DELTA_MEV, PHI
+from sage.lanes import Z30_STAR, MIRROR_PAIRS, PAIR_LABELS, P, improvement, totient
+from sage.lanes import lat_weight as W
 
 def divider(c='═', w=70): print(c * w)
 def header(title):
@@ -252,21 +236,6 @@ if all(h is None for _, h in LONGITUDINAL_DATA):
 
 header("SECTION 7: φ(30) = 8 GLUONS — Verification")
 
-import math
-def totient(n):
-    result = n
-    p = 2
-    temp = n
-    while p * p <= temp:
-        if temp % p == 0:
-            while temp % p == 0:
-                temp //= p
-            result -= result // p
-        p += 1
-    if temp > 1:
-        result -= result // temp
-    return result
-
 phi30 = totient(30)
 print(f"  30 = 2 × 3 × 5")
 print(f"  φ(30) = φ(2)×φ(3)×φ(5) = {totient(2)}×{totient(3)}×{totient(5)} = {phi30}")
@@ -20,10 +20,28 @@ RELATED: gbp_complete_v8-9.py, gbp_coprime_interference_riemann.md
 """
 
 import math
+import os
+import sys
 import mpmath
 
 mpmath.mp.dps = 25
 
+# Shared on-disk Riemann zero store (Hilbert-Polya/python/hp_zeros.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'Hilbert-Polya', 'python'))
+try:
+    from hp_zeros import get_zeros as _stored_zeros
+except ImportError:
+    _stored_zeros = None
+
+
+def riemann_gammas(K):
+    """First K zero ordinates γ_1..γ_K; cached store if available, else mpmath."""
+    if _stored_zeros is not None:
+        # store's standard precision: a lower dps here would seed a store hp_zeros redoes
+        return [float(t) for t in _stored_zeros(K, verbose=False)]
+    return [float(mpmath.zetazero(n).imag) for n in range(1, K + 1)]
+
 PI  = math.pi
 PHI = (1 + math.sqrt(5)) / 2
 
@@ -141,7 +159,7 @@ def part1_mod12():
 def part2_riemann_leptons():
     section("PART 2: Riemann Zeros and Leptonic Mass Structure")
 
-    gammas = [float(mpmath.zetazero(n).imag) for n in range(1, 11)]
+    gammas = riemann_gammas(10)
 
     print("  Riemann zero ratios:")
     for i in range(1, 5):
@@ -165,7 +183,7 @@ def part2_riemann_leptons():
 
     # The r_n sequence and lepton generations
     print("  r_n sequence (normalized zeros) at generational indices:")
-    r_n = {n: float(mpmath.zetazero(n).imag) / (n * NINE_PI_2)
+    r_n = {n: gammas[n-1] / (n * NINE_PI_2)
            for n in range(1, 11)}
     for n, r in r_n.items():
         print(f"  r_{n:>2} = γ_{n}/{n}×9π/2 = {r:.6f}")
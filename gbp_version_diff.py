@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+gbp_version_diff.py — per-baryon regression diff between two GBP model scripts
+=============================================================================
+
+Loads both versions side by side (sage.versions: isolated module namespaces,
+main() never runs), evaluates KNOWN_BARYONS + PREDICTIONS in each and prints
+the per-baryon delta (b − a), MAPE/RMSE and the timing of each full
+evaluation. Results are cached by source hash in --cache, so a rerun only
+re-evaluates a version whose model code changed.
+
+USAGE:
+  python gbp_version_diff.py                       # v7.6 vs v7.7-2
+  python gbp_version_diff.py --a v7.6 --b path/to/gbp_complete_v7_8.py
+  python gbp_version_diff.py --changed --csv diff.csv
+  python gbp_version_diff.py --check               # exit 1 if any prediction moved
+"""
+
+import csv
+import argparse
+
+from sage.versions import compare, changed, DIFF_COLUMNS, VERSIONS
+
+def fmt(v, spec):
+    width = int(spec.lstrip(">+").split(".")[0])
+    return format(v, spec) if v is not None else "—".rjust(width)
+
+def main():
+    parser = argparse.ArgumentParser(description="GBP version diff")
+    parser.add_argument("--a",       default="v7.6",   help=f"label ({', '.join(VERSIONS)}) or script path")
+    parser.add_argument("--b",       default="v7.7-2", help="label or script path")
+    parser.add_argument("--cache",   default="gbp_version_cache.json")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--force",   action="store_true", help="re-evaluate even if the hash is cached")
+    parser.add_argument("--repeat",  type=int, default=5)
+    parser.add_argument("--changed", action="store_true", help="only rows whose prediction moved")
+    parser.add_argument("--csv",     type=str, metavar="PATH")
+    parser.add_argument("--check",   action="store_true", help="exit status 1 if any prediction moved")
+    args = parser.parse_args()
+
+    ra, rb, rows = compare(args.a, args.b, None if args.no_cache else args.cache,
+                           args.repeat, args.force)
+    moved = changed(rows)
+    shown = moved if args.changed else rows
+
+    print(f"  {'Name':<14} {'J':>3} {'obs':>9} {'a':>9} {'b':>9} {'delta':>9} "
+          f"{'err% a':>8} {'err% b':>8}  branch a -> b")
+    print(f"  {'-'*96}")
+    for r in shown:
+        br = r['branch_a'] if r['branch_a'] == r['branch_b'] else f"{r['branch_a']} -> {r['branch_b']}"
+        print(f"  {r['name']:<14} {r['J']:>3} {fmt(r['obs'], '>9.1f')} {fmt(r['final_a'], '>9.1f')} "
+              f"{fmt(r['final_b'], '>9.1f')} {fmt(r['delta'], '>+9.3f')} {fmt(r['err_pct_a'], '>+8.3f')} "
+              f"{fmt(r['err_pct_b'], '>+8.3f')}  {br}")
+    print()
+    for tag, res in (("a", ra), ("b", rb)):
+        t = res['timing']
+        print(f"  {tag}: {res['path']:<32} sha256 {res['sha256'][:12]}  MAPE={res['mape']:.4f}%  "
+              f"RMSE={res['rmse']:.2f} MeV  eval cold {t['cold_s']*1e3:.2f} ms / best "
+              f"{t['best_s']*1e3:.2f} ms{'  (cached)' if res['cached'] else ''}")
+    print(f"  {len(moved)} of {len(rows)} predictions differ")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=DIFF_COLUMNS)
+            w.writeheader()
+            w.writerows(shown)
+    if args.check and moved:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
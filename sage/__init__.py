@@ -0,0 +1,56 @@
+# sage/__init__.py
+# Importable core of the GBP / TFFT scripts.
+#
+#   sage.constants  GBP constants (GEO_B, ALPHA_IR, LAMBDA_QCD, LU, PHI, KAPPA_0, ...)
+#   sage.lanes      Z30* lane geometry and projection weights
+#   sage.gbp        v7.6 baryon predictor (predict_final, run_rows, tables)
+#   sage.alpha_s    two-loop alpha_s running with flavor thresholds
+#   sage.lattice    Hilbert–Pólya lattice builders (numpy/scipy, loaded lazily)
+#   sage.mod30      mod-30 self-consistent quark mass solver and assignment search (numpy)
+#   sage.batch      batched baryon predictor and full multiset scan (numpy)
+#   sage.sensitivity  fit metrics and Jacobian over the GBP constants (numpy)
+#   sage.refit      multistart / LOO-CV refit of the GBP constants (numpy/scipy)
+#   sage.versions   side-by-side regression harness for the gbp_complete_* scripts
+#   sage.montecarlo input-uncertainty Monte Carlo with predictive intervals (numpy)
+#
+# Nothing is imported up front: `import sage` costs only this file, and
+# `sage.predict_final` / `from sage import LU` load the one submodule that
+# defines the name. The core modules are pure math, so numpy, scipy,
+# pandas and matplotlib are never touched unless a caller asks for them.
+
+import importlib
+
+_SUBMODULES = ('constants', 'lanes', 'gbp', 'alpha_s', 'lattice', 'mod30', 'batch', 'sensitivity', 'refit', 'versions', 'montecarlo')
+
+_EXPORTS = {
+    'constants': (
+        'GEO_B', 'ALPHA_IR', 'LAMBDA_QCD', 'LAMBDA_UNIV', 'LU', 'ALPHA_BARYON', 'PHI',
+        'GAMMA_1', 'DELTA_MEV', 'KAPPA_0', 'CONSTITUENT', 'FLAVORS',
+        'HEAVY_FLAVORS', 'LIGHT_FLAVORS',
+    ),
+    'lanes': (
+        'LANE_SET', 'Z30_STAR', 'LANES', 'ANGLES', 'INVERSES', 'MIRROR_PAIRS',
+        'P', 'lat_weight', 'improvement', 'totient',
+    ),
+    'gbp': (
+        'predict_final', 'get_class', 'get_lam', 'run_rows', 'mape', 'rmse', 'fit_group',
+        'winding_metadata', 'BARYON_CLASS', 'KNOWN_BARYONS', 'PREDICTIONS',
+    ),
+    'alpha_s': ('alpha_s_2loop_rg', 'alpha_s_with_thresholds', 'alpha_s_array'),
+    'lattice': ('build_hamiltonian', 'hamiltonian_sparse', 'middle_band', 'TWIST_MODES'),
+}
+_WHERE = {name: mod for mod, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_SUBMODULES) + [n for n, mod in _WHERE.items() if mod != 'lattice']
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _WHERE:
+        value = getattr(importlib.import_module(f'{__name__}.{_WHERE[name]}'), name)
+        globals()[name] = value              # later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
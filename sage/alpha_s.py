@@ -0,0 +1,58 @@
+# sage/alpha_s.py
+# Standard Model reference running of alpha_s: two-loop RG with flavor
+# thresholds at m_c, m_b, m_t (the curve tfft_qcd_goe_gue.py compares the
+# TFFT kernels against). Scalar code is pure math; alpha_s_array imports
+# numpy only when called.
+
+import math
+
+M_Z      = 91.1876
+M_TOP    = 173.0
+M_BOTTOM = 4.18
+M_CHARM  = 1.27
+ALPHA_S_MZ = 0.1179          # PDG Z-pole value
+
+def beta_0(n_f):
+    return (11.0 - 2.0*n_f/3.0) / (4.0*math.pi)
+
+def beta_1(n_f):
+    return (102.0 - 38.0*n_f/3.0) / (16.0*math.pi**2)
+
+def alpha_s_2loop_rg(Q, alpha_ref, Q_ref, n_f):
+    b0 = beta_0(n_f)
+    b1 = beta_1(n_f)
+    L = math.log(Q / Q_ref)
+    denom = 1.0 + alpha_ref * b0 * L
+    if abs(denom) < 1e-10:
+        return alpha_ref
+    alpha_1loop = alpha_ref / denom
+    correction_factor = 1.0 - (b1 / b0) * alpha_ref * L / denom
+    return alpha_1loop * correction_factor
+
+def alpha_s_with_thresholds(Q, alpha_s_Z=ALPHA_S_MZ, Q_Z=M_Z):
+    alpha_current = alpha_s_Z
+    Q_current = Q_Z
+
+    if Q > Q_current:
+        if Q > M_TOP:
+            alpha_current = alpha_s_2loop_rg(M_TOP, alpha_current, Q_current, n_f=5)
+            Q_current = M_TOP
+            return alpha_s_2loop_rg(Q, alpha_current, Q_current, n_f=6)
+        else:
+            return alpha_s_2loop_rg(Q, alpha_current, Q_current, n_f=5)
+    else:
+        if Q < M_CHARM:
+            alpha_at_mb = alpha_s_2loop_rg(M_BOTTOM, alpha_current, Q_current, n_f=5)
+            alpha_at_mc = alpha_s_2loop_rg(M_CHARM, alpha_at_mb, M_BOTTOM, n_f=4)
+            return alpha_s_2loop_rg(Q, alpha_at_mc, M_CHARM, n_f=3)
+        elif Q < M_BOTTOM:
+            alpha_at_mb = alpha_s_2loop_rg(M_BOTTOM, alpha_current, Q_current, n_f=5)
+            return alpha_s_2loop_rg(Q, alpha_at_mb, M_BOTTOM, n_f=4)
+        else:
+            return alpha_s_2loop_rg(Q, alpha_current, Q_current, n_f=5)
+
+def alpha_s_array(Q_array, alpha_s_Z=ALPHA_S_MZ):
+    """alpha_s_with_thresholds over an array of scales (GeV); same shape as Q_array."""
+    import numpy as np
+    out = np.array([alpha_s_with_thresholds(Q, alpha_s_Z) for Q in np.ravel(Q_array)])
+    return out.reshape(np.shape(Q_array))
@@ -0,0 +1,271 @@
+# sage/batch.py
+# Batched GBP v7.6 predictor: the same model as sage.gbp.predict_final,
+# evaluated for thousands of baryons in one array pass.
+#
+# compile_rows turns (name, quarks, J, obs) rows into flat arrays once —
+# quark content as flavor indices / counts over FLAVORS, class codes from
+# BARYON_CLASS (or the get_class fallback), lam, geo factor and branch label.
+# predict_batch then evaluates every branch (light, heavy, J32L, J32H, omega,
+# photon, omega32h_*) on its mask with numpy; results agree with
+# predict_final to rounding.
+#
+# Every model input (measured constants, constituent masses, tuned
+# constants, geo-factor overrides) is a named parameter — default_params()
+# — so predict_batch can also evaluate a stack of parameter sets, real or
+# complex, in the same pass (see sage.sensitivity).
+#
+# scan() enumerates every 3-quark multiset over the six flavors × J, runs it
+# through the get_class fallback (name=None) and returns a sortable table.
+
+import itertools
+
+import numpy as np
+
+from sage.constants import (FLAVORS, CONSTITUENT, HEAVY_FLAVORS, GEO_B, ALPHA_IR, LAMBDA_QCD, LU,
+                            _DELTA_M, LAMBDA_TOPO)
+from sage.lanes import LANES, ANGLES, is_prime
+from sage import gbp
+
+RULES = ('light', 'heavy', 'J32L', 'J32H', 'omega', 'photon', 'omega32h_c', 'omega32h_b')
+U, D, S, C, B, T = range(6)
+
+CONST = np.array([CONSTITUENT[q] for q in FLAVORS])
+LANE  = np.array([LANES[q] for q in FLAVORS])
+ANGLE = np.array([ANGLES[LANES[q]] for q in FLAVORS])
+HEAVY = np.array([q in HEAVY_FLAVORS for q in FLAVORS])
+ANGLE_MOD30 = np.array([ANGLES.get(r, 0.0) for r in range(30)])
+OVERRIDE_NAMES = tuple(gbp.GEO_FACTOR_OVERRIDE)
+
+# ——— MODEL PARAMETERS ———
+def default_params():
+    """
+    The v7.6 inputs predict_batch reads, by name: measured inputs (ALPHA_IR,
+    LAMBDA_QCD, DELTA_M, constituent masses m_<flavor>), the tuned constants
+    and the GEO_FACTOR_OVERRIDE entries as 'GF[<name>]'. Derived constants
+    (LU, ALPHA_BARYON, C_HYP, KAPPA_0) are recomputed from these.
+    """
+    p = dict(ALPHA_IR=ALPHA_IR, LAMBDA_QCD=LAMBDA_QCD, DELTA_M=_DELTA_M,
+             LAM_S1_FREE=gbp.LAM_S1_FREE, R_REINFORCE=gbp.R_REINFORCE, K_OMEGA=gbp.K_OMEGA,
+             PHI_GEOM=gbp.PHI_GEOM, PHI_INT=gbp.PHI_INT, PHI_Z3=gbp.PHI_Z3, Z3_SKEW=gbp.Z3_SKEW,
+             ALPHA_HYP=gbp.ALPHA_HYP, A_DEFAULT=gbp.A_DEFAULT, B_DEFAULT=gbp.B_DEFAULT,
+             C_DEFAULT=gbp.C_DEFAULT)
+    p.update({f"m_{q}": CONSTITUENT[q] for q in FLAVORS})
+    p.update({f"GF[{n}]": v for n, v in gbp.GEO_FACTOR_OVERRIDE.items()})
+    return p
+
+# ——— COMPILE ———
+def compile_rows(rowspec):
+    """
+    Flat arrays for a list of (name, quarks, J, obs) rows: idx (n, 3) flavor
+    indices, counts (n, 6), J, obs (NaN if None), sheet/T/rule codes, geo_sign,
+    geo factor gf, lam (as lam_factor × LU, or the free lam_s1 where lam_free),
+    the branch label predict_final would report, and the parameter-free
+    geometry (skew, Z3 asymmetry, relative angle, reinforce kind).
+    """
+    n = len(rowspec)
+    out = dict(name=np.empty(n, dtype=object), quarks=[], idx=np.zeros((n, 3), dtype=int),
+               J=np.zeros(n), obs=np.full(n, np.nan), sheet=np.empty(n, dtype=object),
+               T=np.empty(n, dtype=object), rule=np.zeros(n, dtype=int), geo_sign=np.zeros(n),
+               gf=np.zeros(n), gf_override=np.full(n, -1), lam=np.zeros(n),
+               lam_factor=np.zeros(n), lam_free=np.zeros(n, dtype=bool),
+               branch=np.empty(n, dtype=object), hyp_on=np.zeros(n, dtype=bool))
+    for k, (name, quarks, J, obs) in enumerate(rowspec):
+        sheet, geo_sign, gf, T, rule = gbp.get_class(name, quarks, J)
+        out['name'][k] = name
+        out['quarks'].append(quarks)
+        out['idx'][k] = [FLAVORS.index(q) for q in quarks]
+        out['J'][k] = J
+        if obs is not None:
+            out['obs'][k] = obs
+        out['sheet'][k], out['T'][k], out['rule'][k] = sheet, T, RULES.index(rule)
+        out['geo_sign'][k], out['gf'][k] = geo_sign, gf
+        if name in gbp.GEO_FACTOR_OVERRIDE and name in gbp.BARYON_CLASS:
+            out['gf_override'][k] = OVERRIDE_NAMES.index(name)
+        T_lam = rule if rule in ('omega32h_c', 'omega32h_b') else T
+        out['lam'][k] = gbp.get_lam(sheet, J, T_lam)
+        out['lam_free'][k] = gbp.LAM.get((sheet, J, T_lam)) is gbp.LAM_S1_FREE
+        out['lam_factor'][k] = out['lam'][k] / LU
+        out['branch'][k] = {'photon': 'photon', 'omega': 'omega', 'light': 'light',
+                            'J32L': f"{sheet}_J32L_{T}", 'J32H': f"{sheet}_J32H_{T}",
+                            'heavy': f"heavy_{T}"}.get(rule, rule)
+        out['hyp_on'][k] = name in gbp.HYPERFINE_WHITELIST
+    idx = out['idx']
+    out['counts'] = np.stack([np.bincount(r, minlength=6) for r in idx]) if n else np.zeros((0, 6), int)
+    out['skew'], out['z3'] = skew_z3_batch(idx)
+    q_heavy = HEAVY[idx]
+    q_hnc = q_heavy & (idx != C)
+    out['has_nc'] = q_hnc.any(axis=1)
+    out['nc_tr'] = np.where(out['has_nc'], relative_angle_batch(idx, ~q_heavy, q_hnc),
+                            relative_angle_batch(idx, ~q_heavy, q_heavy))
+    out['reinforce_kind'] = reinforce_kind(out['counts'])
+    return out
+
+# ——— PER-MULTISET GEOMETRY ———
+def _abs(x):
+    """|x| that stays complex-analytic (for complex-step derivatives)."""
+    return np.where(np.real(x) < 0, -x, x)
+
+def _tri_wave(deg, phi_p):
+    x = deg / phi_p
+    x = np.mod(x, 2.0) if not np.iscomplexobj(x) else np.mod(x.real, 2.0) + 1j * x.imag
+    return 1.0 - 2.0 * _abs(x - 1.0)
+
+def skew_z3_batch(idx):
+    """skew_angle and z3_asymmetry for every row of flavor indices idx (n, 3)."""
+    a = np.sort(ANGLE[idx], axis=1)
+    gaps = np.stack([a[:, 1] - a[:, 0], a[:, 2] - a[:, 0], a[:, 2] - a[:, 1],
+                     720.0 - a[:, 2] + a[:, 0]], axis=1)
+    theta = np.abs(gaps - 240.0).sum(axis=1) / 4
+    cyc = np.stack([a[:, 1] - a[:, 0], a[:, 2] - a[:, 1], a[:, 0] + 720.0 - a[:, 2]], axis=1)
+    return theta, cyc.max(axis=1) - cyc.min(axis=1)
+
+def geo_corr_batch(theta, tz, p):
+    """gbp.geo_corr from skew theta and Z3 asymmetry tz, with the constants in p."""
+    tg = _tri_wave(theta, p['PHI_GEOM']); ti = _tri_wave(theta, p['PHI_INT'])
+    vx = 1.0 - _abs(ti); tz3 = _tri_wave(tz + p['Z3_SKEW'], p['PHI_Z3'])
+    return p['A_DEFAULT'] * tg + p['B_DEFAULT'] * vx + p['C_DEFAULT'] * tz3
+
+def reinforce_kind(counts):
+    """0: none, 1: reinforce = 1, 2: reinforce = K_OMEGA."""
+    u, d, s, c = counts[:, U], counts[:, D], counts[:, S], counts[:, C]
+    return np.where((c == 1) & ((u == 2) | (d == 2)), 1,
+                    np.where((s == 3) | ((s == 2) & (c == 1)), 2, 0))
+
+def _sector_angle(idx, member):
+    """sector_residue_angle of the quarks selected by member (n, 3); 0 where none are."""
+    r = np.where(member, LANE[idx], 1).prod(axis=1) % 30
+    return np.where(member.any(axis=1), ANGLE_MOD30[r], 0.0)
+
+def relative_angle_batch(idx, light, heavy):
+    diff = np.abs(_sector_angle(idx, heavy) - _sector_angle(idx, light))
+    diff = np.where(diff > 360.0, 720.0 - diff, diff)
+    return np.where(light.any(axis=1) & heavy.any(axis=1), diff, 0.0)
+
+def winding_batch(idx):
+    """winding_metadata as arrays: numerator, denominator, numerator_prime, m_topo."""
+    L = LANE[idx].sum(axis=1)
+    g = np.gcd(L, 30)
+    num, den = L // g, 30 // g
+    prime = np.array([is_prime(int(v)) for v in num], dtype=bool)
+    return dict(numerator=num, denominator=den, harmonic_class=den,
+                numerator_prime=prime, m_topo=L / 30 * LAMBDA_TOPO)
+
+# ——— EVALUATE ———
+def predict_batch(tab, params=None):
+    """
+    final mass for every compiled row, branch by branch.
+
+    params overrides default_params() by name; values may be scalars or
+    arrays shaped (P, 1) (one parameter set per row of P), in which case the
+    result is (P, n). Complex values are carried through analytically, so
+    complex-step derivatives work. No module globals are read or changed.
+    """
+    p = default_params()
+    if params:
+        unknown = set(params) - set(p)
+        if unknown:
+            raise KeyError(f"unknown GBP parameters: {sorted(unknown)}")
+        p.update(params)
+    counts, J, rule, tclass = tab['counts'], tab['J'], tab['rule'], tab['T']
+
+    m = [p[f"m_{q}"] for q in FLAVORS]
+    mass = lambda sel: sum(counts[:, f] * m[f] for f in sel)
+    sumC = mass(range(6))
+    M_light, M_nc = mass((U, D, S)), mass((B, T))
+    alpha_baryon = p['ALPHA_IR'] * (2.0 / 3.0)
+    c_hyp = alpha_baryon * p['LAMBDA_QCD'] * gbp.GEO_TWO_7
+    lu = GEO_B / p['ALPHA_IR']
+
+    gf = tab['gf']
+    for k, name in enumerate(OVERRIDE_NAMES):
+        gf = np.where(tab['gf_override'] == k, p[f"GF[{name}]"], gf)
+    lam = np.where(tab['lam_free'], p['LAM_S1_FREE'], lu * tab['lam_factor'])
+
+    chyp = c_hyp * np.where(J == 0.5, -1.0, 3.0)
+    dg = tab['geo_sign'] * alpha_baryon * p['LAMBDA_QCD'] * gf
+    n_charm = counts[:, C]
+    fc = n_charm * m[C] / sumC
+    fl = M_light / sumC
+    fnc = M_nc / sumC
+    gc = geo_corr_batch(tab['skew'], tab['z3'], p)
+    kind = tab['reinforce_kind']
+    rt = np.where(kind == 1, 1.0, np.where(kind == 2, p['K_OMEGA'], 0.0)) * p['R_REINFORCE']
+    ud = (counts[:, U] == 1) & (counts[:, D] == 1) & tab['hyp_on']
+    spec = sumC - m[U] - m[D]
+    kappa_0 = m[U] * m[D] * p['DELTA_M']
+    hyp = np.where(ud, kappa_0 * (np.where(ud, spec, m[S]) / m[S]) ** p['ALPHA_HYP'] / (m[U] * m[D]), 0.0)
+
+    is_t2 = tclass == 'T2'
+    ac = np.where(n_charm == 0, 1.0,
+                  np.where(is_t2, gbp.CHARM_T2_AMP, gbp.CHARM_T3_AMP) ** n_charm)
+    cosn = np.cos(np.where(is_t2, 2, 3) * np.radians(tab['nc_tr']))
+    s1 = tab['sheet'] == 'S1'
+    anc = np.where(tab['has_nc'], np.where(s1 & (rule == RULES.index('J32H')), np.abs(cosn), cosn), 1.0)
+    amp = fl + fc * ac + fnc * anc
+
+    core = sumC + dg + gc + rt + chyp
+    final = core * (1 + lam)                                            # light / fallback
+    r = lambda name: rule == RULES.index(name)
+    final = np.where(r('photon'), (sumC + gc + rt + chyp) * (1 + lam) + hyp, final)
+    omega = r('omega') | r('omega32h_c') | r('omega32h_b')
+    final = np.where(omega, (sumC + dg + 2.0 * gc + rt + chyp) * (1 + lam) + hyp, final)
+    final = np.where(r('J32L') & s1, (sumC + chyp) * (1 + lam), final)
+    amp_form = (sumC + dg + amp * gc + rt + chyp) * (1 + lam)
+    final = np.where(r('J32H'), np.where(s1, (sumC + chyp) * (1 + lam * amp), amp_form), final)
+    final = np.where(r('heavy'), amp_form + hyp, final)
+    return final
+
+def run_batch(rowspec):
+    """run_rows equivalent (name, J, obs, final, err_pct, branch, lam_used, geo_factor) as arrays."""
+    tab = compile_rows(rowspec)
+    final = predict_batch(tab)
+    err = (final - tab['obs']) / tab['obs'] * 100
+    return dict(name=tab['name'], J=tab['J'], obs=tab['obs'], final=final, err_pct=err,
+                branch=tab['branch'], lam_used=tab['lam'], geo_factor=tab['gf'],
+                fit_group=np.array([gbp.fit_group(n) for n in tab['name']], dtype=object))
+
+# ——— MULTISET SCAN ———
+SCAN_COLUMNS = ['quarks', 'J', 'final', 'branch', 'lam_used', 'geo_factor', 'winding_sum',
+                'harmonic_class', 'numerator', 'denominator', 'numerator_prime', 'm_topo',
+                'n_heavy', 'known']
+
+def multisets(n=3):
+    """Every n-quark multiset over FLAVORS (56 for n=3), as sorted flavor lists."""
+    return [list(c) for c in itertools.combinations_with_replacement(FLAVORS, n)]
+
+def scan(J_values=(0.5, 1.5)):
+    """
+    Every 3-quark multiset × J through the get_class fallback, as a list of
+    row dicts sorted by predicted mass. `known` names the catalogued baryons
+    (KNOWN_BARYONS / PREDICTIONS) with the same content and J.
+    """
+    spec = [(None, qs, J, None) for qs in multisets() for J in J_values]
+    tab = compile_rows(spec)
+    final = predict_batch(tab)
+    wm = winding_batch(tab['idx'])
+    known = {}
+    for name, qs, J, _ in gbp.KNOWN_BARYONS + gbp.PREDICTIONS:
+        known.setdefault((tuple(sorted(qs, key=FLAVORS.index)), J), []).append(name)
+    rows = []
+    for k, (_, qs, J, _) in enumerate(spec):
+        num, den = int(wm['numerator'][k]), int(wm['denominator'][k])
+        rows.append(dict(quarks='-'.join(qs), J=J, final=float(final[k]), branch=tab['branch'][k],
+                         lam_used=float(tab['lam'][k]), geo_factor=float(tab['gf'][k]),
+                         winding_sum=f"{num}/{den}" if den != 1 else str(num),
+                         harmonic_class=den, numerator=num, denominator=den,
+                         numerator_prime=bool(wm['numerator_prime'][k]),
+                         m_topo=float(wm['m_topo'][k]), n_heavy=int(HEAVY[tab['idx'][k]].sum()),
+                         known=';'.join(known.get((tuple(qs), J), []))))
+    return sorted(rows, key=lambda r: r['final'])
+
+def write_scan(rows, path):
+    """Write scan rows to CSV, or Parquet when path ends in .parquet (needs pandas + pyarrow)."""
+    if path.endswith('.parquet'):
+        import pandas as pd
+        pd.DataFrame(rows, columns=SCAN_COLUMNS).to_parquet(path, index=False)
+        return
+    import csv
+    with open(path, 'w', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=SCAN_COLUMNS)
+        w.writeheader()
+        w.writerows(rows)
@@ -0,0 +1,46 @@
+# sage/constants.py
+# Shared GBP constants: mod-30 spinor generation weights, Deur IR scale,
+# universal boundary scale, constituent masses and the derived kappa_0.
+# Pure math — importing this never pulls in numpy/scipy.
+
+import math
+
+PI15  = math.pi / 15
+GEN_N = {1: 4, 2: 7, 3: 2}
+GEN_MAP = {'up':1,'down':1,'strange':2,'charm':2,'bottom':3,'top':3}
+
+def s2(gen): return math.sin(GEN_N[gen] * PI15) ** 2
+
+S2_1  = s2(1); S2_2 = s2(2); S2_3 = s2(3)
+GEO_B = math.sin(PI15)**2
+SIN2_36 = math.sin(math.radians(36))**2
+
+ALPHA_IR     = 0.848809          # Deur 2024 IR QCD fixed point
+LAMBDA_QCD   = 217.0             # Deur IR confinement scale (MeV)
+LAMBDA_UNIV  = GEO_B / ALPHA_IR  # Universal boundary scale = 0.050927
+ALPHA_BARYON = ALPHA_IR * (2.0 / 3.0)
+PHI          = (1.0 + math.sqrt(5.0)) / 2.0
+LU           = LAMBDA_UNIV
+GAMMA_1      = 14.134725141734694
+DELTA_MEV    = ALPHA_IR * LAMBDA_QCD   # mass gap = 184.2 MeV
+
+# ── kappa_0 DERIVED (v7.6) ────────────────────────────────────────────────
+# kappa_0 = m_u × m_d × ΔM(Σ0-Λ0)
+# Physical meaning: ud diquark hyperfine amplitude = product of constituent
+# masses × observed isospin-breaking-free Σ0-Λ0 mass split.
+# NOTE: Will be renamed C_ud in v8 to avoid symbol collision with TFFT κ
+_M_U     = 336.0          # up constituent mass (MeV)
+_M_D     = 340.0          # down constituent mass (MeV)
+_DELTA_M = 76.959         # Σ0-Λ0 mass split (MeV, observed)
+KAPPA_0  = _M_U * _M_D * _DELTA_M   # = 8,791,796 MeV³  DERIVED
+
+FLAVORS       = ("up", "down", "strange", "charm", "bottom", "top")
+HEAVY_FLAVORS = {"charm", "bottom", "top"}
+LIGHT_FLAVORS = {"up", "down", "strange"}
+
+CONSTITUENT = {
+    "up":336.0, "down":340.0, "strange":486.0,
+    "charm":1550.0, "bottom":4730.0, "top":173400.0,
+}
+
+LAMBDA_TOPO = CONSTITUENT["up"] / GAMMA_1
@@ -0,0 +1,92 @@
+# sage/lanes.py
+# Z30* lane geometry: the eight coprime residues mod 30, their 720° spinor
+# angles, the quark lane assignment, the GBP projection weights P(r) and the
+# angular quantities (sector residue, relative angle, skew, Z3 asymmetry)
+# the baryon predictor builds on.
+
+import math
+from fractions import Fraction
+
+LANE_SET = [1, 7, 11, 13, 17, 19, 23, 29]
+Z30_STAR = LANE_SET                      # name used by the lattice scripts
+LANES    = {"up":19, "down":11, "strange":7, "charm":23, "bottom":13, "top":17}
+ANGLES   = {r: 720.0 * r / 30.0 for r in LANE_SET}
+
+INVERSES = {}
+for _r in LANE_SET:
+    for _s in LANE_SET:
+        if (_r * _s) % 30 == 1: INVERSES[_r] = _s
+
+MIRROR_PAIRS = [(1, 29), (7, 23), (11, 19), (13, 17)]
+PAIR_LABELS  = {
+    (1, 29):  'colorless / vacuum',
+    (7, 23):  'strange & charm',
+    (11, 19): 'up & down',
+    (13, 17): 'bottom & top',
+}
+
+# ——— PROJECTION WEIGHTS ———
+def P(r):
+    """GBP projection weight for lane r: sin²(rπ/15)."""
+    return math.sin(r * math.pi / 15) ** 2
+
+def lat_weight(r, N=30):
+    """Standard lattice QCD mode weight: sin²(πr/N)."""
+    return math.sin(r * math.pi / N) ** 2
+
+def improvement(r):
+    """P(r) / lat_weight(r, 30) = 4cos²(rπ/30)."""
+    return 4 * math.cos(r * math.pi / 30) ** 2
+
+def totient(n):
+    result = n
+    p = 2
+    temp = n
+    while p * p <= temp:
+        if temp % p == 0:
+            while temp % p == 0:
+                temp //= p
+            result -= result // p
+        p += 1
+    if temp > 1:
+        result -= result // temp
+    return result
+
+# ——— WINDING ———
+def is_prime(n):
+    if n < 2: return False
+    for i in range(2, int(n**0.5) + 1):
+        if n % i == 0: return False
+    return True
+
+def winding_sum(quarks):
+    return sum(Fraction(LANES[q], 30) for q in quarks)
+
+# ——— ANGULAR GEOMETRY ———
+def sector_residue_angle(qs):
+    if not qs: return 0.0
+    r = 1
+    for q in qs: r = (r * LANES[q]) % 30
+    return ANGLES.get(r, 0.0)
+
+def relative_angle(lq, hq):
+    if not lq or not hq: return 0.0
+    diff = abs(sector_residue_angle(hq) - sector_residue_angle(lq))
+    if diff > 360.0: diff = 720.0 - diff
+    return diff
+
+def tri_wave(deg, phi_p):
+    x = (deg / phi_p) % 2.0; return 1.0 - 2.0 * abs(x - 1.0)
+
+def skew_angle(quarks):
+    angs = sorted([ANGLES[LANES[q]] for q in quarks]); gaps = []
+    for i in range(len(angs)):
+        for j in range(i+1, len(angs)): gaps.append(abs(angs[j] - angs[i]))
+    gaps.append(720.0 - angs[-1] + angs[0])
+    return sum(abs(g - 240.0) for g in gaps) / len(gaps)
+
+def z3_asymmetry(quarks):
+    angs = sorted([ANGLES[LANES[q]] for q in quarks])
+    cyc  = angs + [angs[0] + 720.0]
+    gaps = [cyc[i+1] - cyc[i] for i in range(3)]
+    return max(gaps) - min(gaps)
@@ -0,0 +1,33 @@
+# sage/lattice.py
+# The Hilbert–Pólya lattice builders (Hilbert-Polya/python/hp_lattice.py)
+# under the sage namespace. hp_lattice needs numpy/scipy, so it is loaded on
+# first attribute access, not when sage.lattice is imported.
+
+import os
+import sys
+
+_HP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'Hilbert-Polya', 'python')
+
+_NAMES = (
+    'TWIST_MODES', 'pascal_amp', 'chirality', 'hamiltonian_hops', 'build_hamiltonian',
+    'hamiltonian_band', 'middle_band', 'hamiltonian_diagonals', 'diagonals_operator',
+    'hamiltonian_operator', 'hamiltonian_sparse',
+)
+
+def _hp_lattice():
+    if 'hp_lattice' not in sys.modules:
+        sys.path.insert(0, _HP_DIR)
+        try:
+            import hp_lattice  # noqa: F401
+        finally:
+            sys.path.remove(_HP_DIR)
+    return sys.modules['hp_lattice']
+
+def __getattr__(name):
+    if name in _NAMES:
+        return getattr(_hp_lattice(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_NAMES))
@@ -0,0 +1,292 @@
+# sage/mod30.py
+# mod-30 self-consistent quark mass model (mod30_v3.py):
+#     m = m_current + alpha * LAMBDA_QCD / geo(t0 + gamma * (m / LAMBDA_QCD) rad),
+#     geo(t) = max(sin²(t/2), 1e-6),
+# solved by damped fixed-point iteration (0.6 new + 0.4 old).
+#
+# solve_batch runs the iteration for a whole (params × quarks) grid at once —
+# every DE population member and all six quarks in one array pass. Each entry
+# stops at its own convergence step, so converged entries match the scalar
+# loop; entries that hit max_iter are flagged in the convergence mask, and
+# mape_batch and error_table (hence screen) score them as failures. With
+# backend='numba' (or 'auto' when numba is installed) the same loop is compiled;
+# without numba everything falls back to NumPy.
+#
+# search() ranks all 8!/2! = 20,160 flavor -> residue assignments: a grid
+# screen scores every map at once from a (flavor, residue, grid) error table,
+# then the best `top` maps are refit with fit() over a process pool.
+
+import os
+import csv
+import math
+import itertools
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from sage.constants import LAMBDA_QCD, CONSTITUENT, FLAVORS
+
+# BLAS reads these only when it loads: pool workers are spawned with them set
+_THREAD_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+CURRENT  = {'up':2.3,'down':4.8,'strange':95.0,'charm':1275.0,'bottom':4180.0,'top':173100.0}
+RESIDUES = [1, 7, 11, 13, 17, 19, 23, 29]
+ANGLES_720 = {r: 2*360*r/30 for r in RESIDUES}
+ASSIGNMENT = {'up':19,'down':11,'strange':7,'charm':23,'bottom':13,'top':17}
+BOUNDS = [(0.01, 5.0), (-1.0, 1.0)]
+
+M_CURRENT     = np.array([CURRENT[q] for q in FLAVORS])
+M_CONSTITUENT = np.array([CONSTITUENT[q] for q in FLAVORS])
+GEO_FLOOR = 1e-6
+DAMP = 0.6
+
+def geo(t): return max(np.sin(np.radians(t)/2)**2, GEO_FLOOR)
+
+def assignment_angles(assignment=ASSIGNMENT):
+    """t0 (degrees) per flavor, in FLAVORS order."""
+    return np.array([ANGLES_720[assignment[q]] for q in FLAVORS], dtype=float)
+
+# ——— NUMPY KERNEL ———
+def _solve_numpy(t0, m_c, a, g, max_iter, tol):
+    """All inputs flat and equal length; converged entries drop out of the active set.
+    Returns (m, converged)."""
+    deg = 180/np.pi/LAMBDA_QCD
+    geo_v = lambda t: np.maximum(np.sin(np.radians(t)/2)**2, GEO_FLOOR)
+    aL = a*LAMBDA_QCD
+    m = m_c + aL/geo_v(t0)
+    out = m.copy()
+    ok = np.zeros(len(m), dtype=bool)
+    idx = np.arange(len(m))
+    for _ in range(max_iter):
+        m_new = m_c + aL/geo_v(t0 + g*m*deg)
+        done = np.abs(m_new - m)/(np.abs(m) + 1e-10) < tol
+        if done.any():
+            out[idx[done]] = m_new[done]
+            ok[idx[done]] = True
+            keep = ~done
+            idx, t0, m_c, aL, g = idx[keep], t0[keep], m_c[keep], aL[keep], g[keep]
+            m, m_new = m[keep], m_new[keep]
+            if len(idx) == 0:
+                return out, ok
+        m = DAMP*m_new + (1 - DAMP)*m
+    out[idx] = m
+    return out, ok
+
+# ——— COMPILED KERNEL (optional) ———
+def _solve_loop(t0, m_c, a, g, max_iter, tol, lam, out, ok):
+    """Scalar reference loop over out's (P, Q) grid; compiled by numba when available."""
+    deg = 180/math.pi/lam
+    for i in range(out.shape[0]):
+        for j in range(out.shape[1]):
+            s = math.sin(math.radians(t0[i, j])/2)**2
+            m = m_c[i, j] + a[i, j]*lam/max(s, 1e-6)
+            res = m
+            ok[i, j] = False
+            for _ in range(max_iter):
+                s = math.sin(math.radians(t0[i, j] + g[i, j]*m*deg)/2)**2
+                m_new = m_c[i, j] + a[i, j]*lam/max(s, 1e-6)
+                if abs(m_new - m)/(abs(m) + 1e-10) < tol:
+                    res = m_new
+                    ok[i, j] = True
+                    break
+                m = DAMP*m_new + (1 - DAMP)*m
+                res = m
+            out[i, j] = res
+    return out, ok
+
+_JIT = {}
+
+def _numba_kernel():
+    if 'loop' not in _JIT:
+        try:
+            from numba import njit
+            _JIT['loop'] = njit(cache=True)(_solve_loop)
+        except ImportError:
+            _JIT['loop'] = None
+    return _JIT['loop']
+
+def solve_batch(t0, m_c, a, g, max_iter=300, tol=1e-7, backend='auto', converged=False):
+    """
+    Damped fixed point for every (param, quark) entry. t0, m_c broadcast over
+    the quark axis (Q,) or (P, Q); a, g over the parameter axis (P,).
+    Returns (P, Q) masses, or (masses, converged mask) with converged=True;
+    entries that hit max_iter hold the last damped iterate.
+    backend: 'auto' | 'numpy' | 'numba'.
+    """
+    a = np.atleast_1d(np.asarray(a, dtype=float))[:, None]
+    g = np.atleast_1d(np.asarray(g, dtype=float))[:, None]
+    shape = np.broadcast_shapes(a.shape, g.shape, np.atleast_2d(t0).shape, np.atleast_2d(m_c).shape)
+    b = [np.ascontiguousarray(np.broadcast_to(np.asarray(x, dtype=float), shape))
+         for x in (t0, m_c, a, g)]
+    kernel = None if backend == 'numpy' else _numba_kernel()
+    if backend == 'numba' and kernel is None:
+        raise ImportError("backend='numba' requested but numba is not installed")
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        if kernel is None:
+            m, ok = (x.reshape(shape) for x in _solve_numpy(*(x.ravel() for x in b), max_iter, tol))
+        else:
+            m, ok = kernel(*b, max_iter, tol, LAMBDA_QCD, np.empty(shape), np.empty(shape, dtype=np.bool_))
+    return (m, ok) if converged else m
+
+def solve(quark, res, a, g, max_iter=300, tol=1e-7):
+    """Scalar solve for one quark on residue lane res (mod30_v3.solve)."""
+    i = FLAVORS.index(quark)
+    return float(solve_batch([ANGLES_720[res]], [M_CURRENT[i]], a, g, max_iter, tol, 'numpy')[0, 0])
+
+# ——— OBJECTIVE AND FIT ———
+def mape_batch(params, t0=None, backend='auto'):
+    """
+    MAPE (%) vs constituent masses for each row (alpha, gamma) of params (P, 2);
+    rows with alpha <= 0 or any non-converged quark score 1e9.
+    """
+    params = np.atleast_2d(params)
+    a, g = params[:, 0], params[:, 1]
+    t0 = assignment_angles() if t0 is None else t0
+    m, ok = solve_batch(t0, M_CURRENT, np.where(a > 0, a, 1.0), g, backend=backend, converged=True)
+    err = np.mean(np.abs(m - M_CONSTITUENT)/M_CONSTITUENT, axis=-1)*100
+    return np.where((a > 0) & ok.all(axis=-1), err, 1e9)
+
+def fit(assignment=ASSIGNMENT, seed=42, maxiter=800, tol=1e-9, popsize=25, backend='auto', **kw):
+    """
+    differential_evolution over (alpha, gamma) with the whole population scored
+    per generation in one mape_batch call. Returns (alpha, gamma, mape).
+    """
+    from scipy.optimize import differential_evolution
+    t0 = assignment_angles(assignment)
+    res = differential_evolution(lambda x: mape_batch(x.T, t0, backend), BOUNDS, seed=seed,
+                                 maxiter=maxiter, tol=tol, popsize=popsize,
+                                 vectorized=True, updating='deferred', **kw)
+    return res.x[0], res.x[1], float(res.fun)
+
+# ——— ASSIGNMENT SEARCH ———
+SEARCH_COLUMNS = list(FLAVORS) + ['unused', 'screen_mape', 'alpha', 'gamma', 'mape']
+
+def all_assignments(residues=RESIDUES):
+    """Every injective flavor -> residue map, as residue tuples in FLAVORS order."""
+    return list(itertools.permutations(residues, len(FLAVORS)))
+
+def error_table(alphas, gammas, backend='auto'):
+    """
+    Relative error |m - m_QCD| / m_QCD of every flavor on every residue lane
+    over the alphas × gammas grid: shape (6, 8, G). A map's MAPE at each grid
+    point is then the mean of six rows of this table. Non-converged solves are inf.
+    """
+    a, g = (x.ravel() for x in np.meshgrid(alphas, gammas, indexing='ij'))
+    t0 = np.tile([ANGLES_720[r] for r in RESIDUES], len(FLAVORS))
+    m_c = np.repeat(M_CURRENT, len(RESIDUES))
+    m_q = np.repeat(M_CONSTITUENT, len(RESIDUES))
+    m, ok = solve_batch(t0, m_c, a, g, backend=backend, converged=True)
+    err = np.where(ok, np.abs(m - m_q)/m_q, np.inf)
+    return np.ascontiguousarray(err.T).reshape(len(FLAVORS), len(RESIDUES), -1)
+
+def screen(assignments, alphas, gammas, chunk=64, backend='auto'):
+    """
+    Grid-best MAPE (%) and (alpha, gamma) for every assignment. Exhaustive over
+    the grid, vectorized over chunks of assignments. Returns (mape, alpha, gamma).
+    """
+    E = error_table(alphas, gammas, backend)
+    E[~np.isfinite(E)] = np.inf                                        # diverged / unconverged solves never win
+    pos = {r: k for k, r in enumerate(RESIDUES)}
+    ridx = np.array([[pos[r] for r in asg] for asg in assignments])
+    a, g = (x.ravel() for x in np.meshgrid(alphas, gammas, indexing='ij'))
+    best = np.empty(len(ridx), dtype=int)
+    score = np.empty(len(ridx))
+    for c in range(0, len(ridx), chunk):
+        rows = ridx[c:c + chunk]
+        tot = E[0, rows[:, 0]]                                         # (chunk, G)
+        for f in range(1, len(FLAVORS)):
+            tot += E[f, rows[:, f]]
+        best[c:c + chunk] = np.argmin(tot, axis=1)
+        score[c:c + chunk] = tot[np.arange(len(rows)), best[c:c + chunk]]
+    return score/len(FLAVORS)*100, a[best], g[best]
+
+def _row(asg, screen_mape, a, g, fun):
+    return dict(zip(FLAVORS, asg), unused=' '.join(str(r) for r in RESIDUES if r not in asg),
+                screen_mape=screen_mape, alpha=a, gamma=g, mape=fun)
+
+def _refine(args):
+    asg, screen_mape, fit_kw = args
+    a, g, fun = fit(dict(zip(FLAVORS, asg)), **fit_kw)
+    return _row(asg, screen_mape, float(a), float(g), fun)
+
+@contextmanager
+def _thread_env(n=1):
+    """Set the BLAS/OpenMP thread variables for processes started inside the block."""
+    old = {var: os.environ.get(var) for var in _THREAD_VARS}
+    os.environ.update({var: str(n) for var in _THREAD_VARS})
+    try:
+        yield
+    finally:
+        for var, val in old.items():
+            if val is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = val
+
+def search(top=200, grid=120, out_csv=None, max_workers=None, verbose=True, **fit_kw):
+    """
+    Rank flavor -> residue assignments by MAPE.
+
+    Every map is screened on a grid × grid (alpha, gamma) mesh over BOUNDS;
+    the best `top` by screen MAPE (top=None or 0: all of them) are refit with
+    fit() in a process pool. Refit rows are appended to out_csv as they
+    finish and maps already there are skipped, so an interrupted search
+    resumes. Returns all refit rows sorted by mape.
+    """
+    asgs = all_assignments()
+    alphas = np.linspace(*BOUNDS[0], grid)
+    gammas = np.linspace(*BOUNDS[1], grid)
+    s_mape, _, _ = screen(asgs, alphas, gammas, backend=fit_kw.get('backend', 'auto'))
+    order = np.argsort(s_mape, kind='stable')[:top or None]
+    if verbose:
+        print(f"Screened {len(asgs)} assignments on a {grid}x{grid} grid; refitting {len(order)}")
+
+    done = {}
+    if out_csv and os.path.exists(out_csv) and os.path.getsize(out_csv) > 0:
+        with open(out_csv, newline='') as f:
+            for r in csv.DictReader(f):
+                asg = tuple(int(r[q]) for q in FLAVORS)
+                done[asg] = dict(r, **{q: int(r[q]) for q in FLAVORS},
+                                 **{k: float(r[k]) for k in ('screen_mape', 'alpha', 'gamma', 'mape')})
+    todo = [(asgs[i], float(s_mape[i]), fit_kw) for i in order if asgs[i] not in done]
+    rows = [done[asgs[i]] for i in order if asgs[i] in done]
+    if verbose and done:
+        print(f"Resuming: {len(rows)} assignments already in {out_csv}, {len(todo)} to go")
+
+    if todo:
+        max_workers = max_workers or min(len(todo), os.cpu_count() or 1)
+        ctx = multiprocessing.get_context('spawn')     # a forked worker keeps the parent's BLAS
+        f = open(out_csv, 'a', newline='') if out_csv else None
+        try:
+            writer = None
+            if f is not None:
+                writer = csv.DictWriter(f, fieldnames=SEARCH_COLUMNS)
+                if f.tell() == 0:
+                    writer.writeheader()
+            with _thread_env(), ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+                jobs = [pool.submit(_refine, t) for t in todo]
+                for k, job in enumerate(as_completed(jobs), 1):
+                    row = job.result()
+                    rows.append(row)
+                    if writer is not None:
+                        writer.writerow(row)
+                        f.flush()
+                    if verbose and (k % 50 == 0 or k == len(todo)):
+                        print(f"  refit {k}/{len(todo)}  best so far {min(r['mape'] for r in rows):.3f}%")
+        finally:
+            if f is not None:
+                f.close()
+
+    return sorted(rows, key=lambda r: r['mape'])
+
+def write_table(rows, path):
+    """Ranked assignment table (CSV), rank 1 = lowest MAPE."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=['rank'] + SEARCH_COLUMNS)
+        w.writeheader()
+        for k, r in enumerate(rows, 1):
+            w.writerow(dict(r, rank=k))
+    os.replace(tmp, path)
@@ -0,0 +1,110 @@
+# sage/montecarlo.py
+# Monte Carlo propagation of input uncertainties through GBP v7.6.
+#
+# The measured / assigned inputs — constituent masses, ALPHA_IR, LAMBDA_QCD
+# and ΔM(Σ0-Λ0) — are drawn as independent Gaussians (SIGMA) and every
+# baryon is evaluated for a whole chunk of draws in one sage.batch pass
+# (predict_batch with (chunk, 1) parameter columns). Draws are processed in
+# chunks so memory stays at O(chunk × rows) for any N: per-row moments are
+# accumulated exactly, quantiles from a fine fixed-bin histogram whose range
+# is set by the first chunk.
+#
+# LAM_S1_FREE is defined as 1.15 × LU = 1.15 × GEO_B / ALPHA_IR, so by
+# default it follows each ALPHA_IR draw instead of staying at its v7.6 value.
+
+import os
+import csv
+
+import numpy as np
+
+from sage import gbp
+from sage.constants import ALPHA_IR
+from sage.batch import compile_rows, predict_batch, default_params
+
+# 1σ input uncertainties. ΔM is the PDG Σ0 and Λ errors in quadrature; the
+# rest are working assumptions (constituent masses are model inputs, the
+# Deur IR values carry no single quoted error) — override via sigma=.
+SIGMA = {
+    'ALPHA_IR':   0.010,
+    'LAMBDA_QCD': 10.0,       # MeV
+    'DELTA_M':    0.025,      # MeV
+    'm_up':       5.0,
+    'm_down':     5.0,
+    'm_strange':  10.0,
+    'm_charm':    30.0,
+    'm_bottom':   50.0,
+    'm_top':      300.0,
+}
+QUANTILES = (0.025, 0.16, 0.5, 0.84, 0.975)
+
+def draw(rng, n, sigma=None, tie_lam_s1=True):
+    """n parameter draws as a predict_batch params dict of (n, 1) columns."""
+    sigma = SIGMA if sigma is None else sigma
+    p0 = default_params()
+    names = [k for k, s in sigma.items() if s]
+    x = np.array([p0[k] for k in names]) + rng.standard_normal((n, len(names))) * \
+        np.array([sigma[k] for k in names])
+    params = {k: x[:, [j]] for j, k in enumerate(names)}
+    if tie_lam_s1 and 'ALPHA_IR' in params:
+        params['LAM_S1_FREE'] = gbp.LAM_S1_FREE * (ALPHA_IR / params['ALPHA_IR'])
+    return params
+
+def propagate(n=100_000, rowspec=None, sigma=None, chunk=20_000, seed=0, tie_lam_s1=True,
+              quantiles=QUANTILES, bins=4096):
+    """
+    Predictive distribution of every row (default KNOWN_BARYONS + PREDICTIONS)
+    under n input draws. Returns one dict per row: point (v7.6 value), mean,
+    std, the requested quantiles as q<percent>, in_95 (obs inside the
+    2.5–97.5% band, None without obs) and clipped (draws outside the
+    histogram range, counted in its end bins).
+    """
+    rowspec = gbp.KNOWN_BARYONS + gbp.PREDICTIONS if rowspec is None else rowspec
+    tab = compile_rows(rowspec)
+    rows = len(rowspec)
+    rng = np.random.default_rng(seed)
+    s1 = np.zeros(rows); s2 = np.zeros(rows)
+    hist = np.zeros(rows * bins, dtype=np.int64)
+    clipped = np.zeros(rows, dtype=np.int64)
+    lo = width = None
+    done = 0
+    while done < n:
+        m = min(chunk, n - done)
+        y = predict_batch(tab, draw(rng, m, sigma, tie_lam_s1))
+        if lo is None:
+            mu, sd = y.mean(axis=0), y.std(axis=0)
+            lo = np.minimum(y.min(axis=0), mu - 8 * sd)
+            width = np.maximum(np.maximum(y.max(axis=0), mu + 8 * sd) - lo, 1e-9) / bins
+            ref = mu
+        d = y - ref
+        s1 += d.sum(axis=0); s2 += (d * d).sum(axis=0)
+        k = np.floor((y - lo) / width).astype(np.int64)
+        clipped += ((k < 0) | (k >= bins)).sum(axis=0)
+        k = np.clip(k, 0, bins - 1) + np.arange(rows) * bins
+        hist += np.bincount(k.ravel(), minlength=rows * bins)
+        done += m
+
+    mean = ref + s1 / n
+    std = np.sqrt(np.maximum(s2 / n - (s1 / n) ** 2, 0.0))
+    cdf = np.cumsum(hist.reshape(rows, bins), axis=1) / n
+    edges = lo[:, None] + width[:, None] * np.arange(1, bins + 1)
+    qs = np.array([[np.interp(q, cdf[r], edges[r]) for q in quantiles] for r in range(rows)])
+    point = predict_batch(tab)
+
+    out = []
+    for r, (name, _, J, obs) in enumerate(rowspec):
+        row = dict(name=name, J=J, obs=obs, point=float(point[r]), mean=float(mean[r]),
+                   std=float(std[r]), **{f"q{q*100:g}": float(v) for q, v in zip(quantiles, qs[r])})
+        row['in_95'] = None if obs is None or 'q2.5' not in row or 'q97.5' not in row \
+            else bool(row['q2.5'] <= obs <= row['q97.5'])
+        row['clipped'] = int(clipped[r])
+        out.append(row)
+    return out
+
+def write_intervals(rows, path):
+    """MC table (CSV), written atomically."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+    os.replace(tmp, path)
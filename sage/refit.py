@@ -0,0 +1,201 @@
+# sage/refit.py
+# Refit the GBP v7.6 free parameter (LAM_S1_FREE) and any other named
+# constants from sage.batch.default_params() — the GEO_FACTOR_OVERRIDE
+# entries, the tri-wave periods, ... — against KNOWN_BARYONS.
+#
+# The objective is MAPE or RMSE over all observed baryons or one fit_group
+# (clean / wide / degen). Starts are drawn in a box around the v7.6 values,
+# screened with one vectorized sage.sensitivity.evaluate call, and the best
+# are polished with L-BFGS-B using the complex-step gradient (or any other
+# scipy.optimize.minimize method). Each fold (the
+# full fit, or one left-out baryon for LOO-CV) is one job in a process pool.
+# Everything is seeded, so the same arguments give the same JSON report.
+# The report flags parameters that ended on a bound of the box (the optimum
+# may lie outside it) and records a hash of every sage source the objective
+# runs through.
+
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy.optimize import minimize
+
+from sage import gbp, sensitivity
+from sage.sensitivity import theta0, evaluate, jacobian, GROUPS
+
+# BLAS reads these only when it loads: pool workers are spawned with them set
+_THREAD_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+FIT_PARAMS = ('LAM_S1_FREE',)
+METRICS = ('mape', 'rmse')
+# model code the objective depends on: source_sha256 covers all of it
+SOURCES = ('constants.py', 'lanes.py', 'gbp.py', 'batch.py', 'sensitivity.py')
+
+def bounds(names, spread=0.5):
+    """Box of ± spread × |v7.6 value| around each parameter (± spread where it is 0)."""
+    t = theta0(names)
+    w = spread * np.where(t != 0, np.abs(t), 1.0)
+    return np.stack([t - w, t + w], axis=1)
+
+def at_bound(theta, box, rtol=1e-6):
+    """Per parameter: True where theta sits on (within rtol × width of) a box edge."""
+    tol = rtol * (box[:, 1] - box[:, 0])
+    return (theta <= box[:, 0] + tol) | (theta >= box[:, 1] - tol)
+
+def source_hash():
+    """SHA-256 over the SOURCES files, in order."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for n in SOURCES:
+        with open(os.path.join(here, n), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def fit_mask(group=None):
+    """KNOWN_BARYONS rows the objective runs over: all, or one fit_group."""
+    if group is not None and group not in GROUPS:
+        raise ValueError(f"group must be one of {GROUPS}, not {group!r}")
+    return np.array([obs is not None and (group is None or gbp.fit_group(name) == group)
+                     for name, _, _, obs in gbp.KNOWN_BARYONS])
+
+def objective(theta, names=FIT_PARAMS, metric='mape', mask=None):
+    """MAPE (%) or RMSE (MeV) at theta; a (P, p) stack gives a (P,) array."""
+    return evaluate(theta, names, mask=mask)[metric]
+
+def _fun_grad(theta, names, metric, mask):
+    j = jacobian(theta, names, mask=mask)
+    return float(j[metric]), j[f"d{metric}"]
+
+def _polish(x0, names, metric, mask, box, method, maxiter):
+    if method == 'L-BFGS-B':
+        r = minimize(_fun_grad, x0, args=(names, metric, mask), jac=True, method=method,
+                     bounds=box, options=dict(maxiter=maxiter))
+    else:
+        r = minimize(lambda x: float(objective(x, names, metric, mask)), x0, method=method,
+                     bounds=box, options=dict(maxiter=maxiter))
+    return r.x, float(r.fun), int(r.nit)
+
+def _fit_fold(args):
+    fold, names, metric, mask, box, starts, screen, seed, method, maxiter = args
+    rng = np.random.default_rng([seed, fold + 1])
+    cand = box[:, 0] + rng.random((screen * starts, len(names))) * (box[:, 1] - box[:, 0])
+    cand = np.vstack([theta0(names), cand])
+    f = objective(cand, names, metric, mask)
+    best = None
+    for x0 in cand[np.argsort(f, kind='stable')[:starts]]:
+        x, fun, nit = _polish(x0, names, metric, mask, box, method, maxiter)
+        if best is None or fun < best[1]:
+            best = (x, fun, nit)
+    return fold, best
+
+@contextmanager
+def _thread_env(n=1):
+    """Set the BLAS/OpenMP thread variables for processes started inside the block."""
+    old = {var: os.environ.get(var) for var in _THREAD_VARS}
+    os.environ.update({var: str(n) for var in _THREAD_VARS})
+    try:
+        yield
+    finally:
+        for var, val in old.items():
+            if val is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = val
+
+def _summary(theta, names):
+    e = evaluate(theta, names)
+    return {k: float(v) for k, v in e.items() if k.startswith(('mape', 'rmse'))}
+
+def refit(names=FIT_PARAMS, metric='mape', group=None, starts=8, screen=32, spread=0.5,
+          loo=False, seed=0, method='L-BFGS-B', maxiter=200, max_workers=None, verbose=True):
+    """
+    Fit names to KNOWN_BARYONS by multistart local minimization; returns a report dict.
+
+    Fold -1 fits every baryon in the group; with loo=True each baryon is also
+    left out in turn and predicted from the parameters fitted without it
+    (cv_mape / cv_rmse over the held-out errors). Per fold, screen × starts
+    random points in bounds(names, spread) plus the v7.6 values are scored
+    in one batch and the best `starts` are polished with scipy `method`
+    (L-BFGS-B uses the complex-step gradient; MAPE is only piecewise smooth,
+    so 'Nelder-Mead' can go further on it at ~20× the cost). at_bound marks
+    parameters whose fitted value is on an edge of the box — widen spread
+    and refit before trusting those.
+    """
+    names = tuple(names)
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, not {metric!r}")
+    box = bounds(names, spread)
+    base = fit_mask(group)
+    folds = [(-1, base)]
+    if loo:
+        folds += [(k, base & (np.arange(len(base)) != k)) for k in np.flatnonzero(base)]
+    jobs = [(k, names, metric, m, box, starts, screen, seed, method, maxiter) for k, m in folds]
+
+    t_start = time.perf_counter()
+    results = {}
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers == 1:
+        for job in jobs:
+            k, best = _fit_fold(job)
+            results[k] = best
+    else:
+        ctx = multiprocessing.get_context('spawn')     # a forked worker keeps the parent's BLAS
+        with _thread_env(), ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            for fut in as_completed([pool.submit(_fit_fold, j) for j in jobs]):
+                k, best = fut.result()
+                results[k] = best
+    elapsed = time.perf_counter() - t_start
+
+    x, fun, nit = results[-1]
+    e0, e1 = evaluate(theta0(names), names), evaluate(x, names)
+    report = dict(
+        config=dict(names=list(names), metric=metric, group=group, starts=starts, screen=screen,
+                    spread=spread, loo=loo, seed=seed, method=method, maxiter=maxiter),
+        source_sha256=source_hash(), sources=list(SOURCES),
+        bounds={n: [float(lo), float(hi)] for n, (lo, hi) in zip(names, box)},
+        theta0=dict(zip(names, map(float, theta0(names)))),
+        theta=dict(zip(names, map(float, x))),
+        at_bound=dict(zip(names, map(bool, at_bound(x, box)))),
+        objective=fun, nit=nit,
+        before=_summary(theta0(names), names), after=_summary(x, names),
+        baryons=[dict(name=n, obs=float(o), pred0=float(p0), pred=float(p1), fit=bool(m))
+                 for n, o, p0, p1, m in zip(e1['name'], e1['obs'], e0['pred'], e1['pred'], base)
+                 if not np.isnan(o)],
+    )
+    if loo:
+        held = []
+        for k in sorted(results):
+            if k < 0:
+                continue
+            xk, fk, _ = results[k]
+            pk = float(evaluate(xk, names)['pred'][k])
+            obs = float(e1['obs'][k])
+            held.append(dict(name=e1['name'][k], obs=obs, pred=pk, err_pct=(pk - obs) / obs * 100,
+                             train_objective=fk, theta=dict(zip(names, map(float, xk))),
+                             at_bound=dict(zip(names, map(bool, at_bound(xk, box))))))
+        err = np.array([h['err_pct'] for h in held])
+        res = np.array([h['pred'] - h['obs'] for h in held])
+        report['loo'] = dict(folds=held, cv_mape=float(np.mean(np.abs(err))),
+                             cv_rmse=float(np.sqrt(np.mean(res ** 2))))
+    report['elapsed_s'] = elapsed
+    if verbose:
+        print(f"Refit {len(names)} param(s), {metric.upper()} over {group or 'all'}: "
+              f"{len(jobs)} fold(s) x {starts} starts in {elapsed:.1f}s")
+        edge = [n for n, b in report['at_bound'].items() if b]
+        if edge:
+            print(f"WARNING: {', '.join(edge)} ended on the bound of the search box "
+                  f"(spread={spread}); the optimum may lie outside it")
+    return report
+
+def write_report(report, path):
+    """Write a refit report as JSON (atomically). elapsed_s is the only run-dependent field."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    os.replace(tmp, path)
@@ -0,0 +1,110 @@
+# sage/sensitivity.py
+# GBP v7.6 as a function of a parameter vector, and its Jacobian.
+#
+# evaluate(theta, names) gives the per-baryon predictions, MAPE and RMSE
+# (overall and per fit_group) for KNOWN_BARYONS with the named parameters
+# set to theta. theta may be one vector (p,) or a stack (P, p); a stack is
+# evaluated in one sage.batch pass. Nothing in sage.gbp is modified — the
+# defaults come from sage.batch.default_params().
+#
+# jacobian(theta, names) returns d(pred)/d(param) for every baryon at once:
+# with method='complex' each parameter gets an imaginary step i·h in its own
+# row of the stack (exact to rounding, no subtractive cancellation); with
+# method='forward' the stack is the base point plus one forward step per
+# parameter. d(MAPE)/d(param) and d(RMSE)/d(param) follow by the chain rule.
+
+import numpy as np
+
+from sage import gbp
+from sage.batch import compile_rows, predict_batch, default_params, OVERRIDE_NAMES
+
+# the tuned constants, then the hard-coded geo factors
+PARAMS = ('LAM_S1_FREE', 'R_REINFORCE', 'K_OMEGA', 'PHI_GEOM', 'PHI_INT', 'PHI_Z3',
+          'Z3_SKEW', 'ALPHA_HYP') + tuple(f"GF[{n}]" for n in OVERRIDE_NAMES)
+GROUPS = ('clean', 'wide', 'degen')
+
+_TABLES = {}
+
+def _table(rowspec):
+    key = id(rowspec)
+    if key not in _TABLES or _TABLES[key][0] is not rowspec:
+        tab = compile_rows(rowspec)
+        tab['fit_group'] = np.array([gbp.fit_group(n) for n in tab['name']], dtype=object)
+        _TABLES[key] = (rowspec, tab)
+    return _TABLES[key][1]
+
+def theta0(names=PARAMS):
+    """The v7.6 values of the named parameters, as a vector."""
+    p = default_params()
+    return np.array([p[n] for n in names], dtype=float)
+
+def _params(theta, names):
+    theta = np.asarray(theta)
+    if theta.shape[-1] != len(names):
+        raise ValueError(f"theta has {theta.shape[-1]} entries for {len(names)} names")
+    if theta.ndim == 1:
+        return dict(zip(names, theta))
+    return {n: theta[:, [k]] for k, n in enumerate(names)}
+
+def _metrics(pred, tab, mask):
+    obs = tab['obs'][mask]
+    res = pred[..., mask] - obs
+    out = dict(mape=np.mean(np.abs(res) / obs, axis=-1) * 100,
+               rmse=np.sqrt(np.mean(res ** 2, axis=-1)))
+    for g in GROUPS:
+        gm = tab['fit_group'][mask] == g
+        if gm.any():
+            out[f"mape_{g}"] = np.mean(np.abs(res[..., gm]) / obs[gm], axis=-1) * 100
+            out[f"rmse_{g}"] = np.sqrt(np.mean(res[..., gm] ** 2, axis=-1))
+    return out
+
+def evaluate(theta=None, names=PARAMS, rowspec=None, mask=None):
+    """
+    Predictions and fit metrics with names set to theta (default: v7.6 values).
+
+    rowspec defaults to KNOWN_BARYONS; metrics use the rows with an observed
+    mass, restricted further by the boolean mask if given (e.g. to leave one
+    baryon out). Returns dict(name, obs, pred, mape, rmse, mape_<group>,
+    rmse_<group>); with a (P, p) theta, pred is (P, n) and metrics are (P,).
+    """
+    tab = _table(gbp.KNOWN_BARYONS if rowspec is None else rowspec)
+    if theta is None:
+        theta = theta0(names)
+    pred = predict_batch(tab, _params(theta, names))
+    fit = ~np.isnan(tab['obs']) if mask is None else (np.asarray(mask) & ~np.isnan(tab['obs']))
+    return dict(name=tab['name'], obs=tab['obs'], pred=pred, **_metrics(pred, tab, fit))
+
+def jacobian(theta=None, names=PARAMS, rowspec=None, method='complex', h=None, mask=None):
+    """
+    d(pred)/d(param) for every row, all parameters in one batched pass.
+
+    method='complex' (default) uses the complex step Im f(θ + i·h·e_k) / h with
+    h = 1e-20; method='forward' uses (f(θ + h_k·e_k) - f(θ)) / h_k with
+    h_k = √eps · max(1, |θ_k|) unless h is given. Returns dict(names, theta,
+    pred (n,), jac (n, p), dmape (p,), drmse (p,), mape, rmse); the metrics
+    and their gradients are over the rows with an observed mass (and in mask).
+    """
+    tab = _table(gbp.KNOWN_BARYONS if rowspec is None else rowspec)
+    theta = theta0(names) if theta is None else np.asarray(theta, dtype=float)
+    p = len(names)
+    if method == 'complex':
+        h = 1e-20 if h is None else h
+        stack = theta + 1j * h * np.eye(p)
+        out = predict_batch(tab, _params(stack, names))
+        pred, jac = out[0].real, (out.imag / h).T
+    elif method == 'forward':
+        step = np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(theta)) if h is None \
+            else np.broadcast_to(h, theta.shape).astype(float)
+        stack = np.vstack([theta, theta + np.diag(step)])
+        out = predict_batch(tab, _params(stack, names))
+        pred, jac = out[0], ((out[1:] - out[0]) / step[:, None]).T
+    else:
+        raise ValueError(f"method must be 'complex' or 'forward', not {method!r}")
+
+    fit = ~np.isnan(tab['obs']) if mask is None else (np.asarray(mask) & ~np.isnan(tab['obs']))
+    obs, res, jf = tab['obs'][fit], pred[fit] - tab['obs'][fit], jac[fit]
+    rmse = np.sqrt(np.mean(res ** 2))
+    return dict(names=tuple(names), theta=theta, pred=pred, jac=jac,
+                dmape=np.mean(np.sign(res)[:, None] / obs[:, None] * jf, axis=0) * 100,
+                drmse=np.mean(res[:, None] * jf, axis=0) / rmse,
+                mape=np.mean(np.abs(res) / obs) * 100, rmse=rmse)
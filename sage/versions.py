@@ -0,0 +1,140 @@
+# sage/versions.py
+# Side-by-side regression harness for the GBP model scripts.
+#
+# Each version (gbp_complete_v7_6.py, QCD/gbp_complete_v7_7-2.py, or any
+# other script with the same predict_final / KNOWN_BARYONS / PREDICTIONS
+# layout) is executed in its own module namespace — not registered in
+# sys.modules, and with __name__ != "__main__" so main() never runs. Its
+# full evaluation (KNOWN_BARYONS + PREDICTIONS) is timed and stored in a
+# JSON cache keyed by the SHA-256 of its source (plus the sage core it
+# imports, for scripts that import sage), so a rerun only reloads a
+# version whose model code changed. Scripts that import sage share its
+# process-wide tables, so those are emptied before the cold run.
+
+import os
+import re
+import json
+import time
+import math
+import hashlib
+import importlib.util
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SAGE_CORE = ('constants.py', 'lanes.py', 'gbp.py')
+
+VERSIONS = {
+    'v7.6':   os.path.join(_ROOT, 'gbp_complete_v7_6.py'),
+    'v7.7-2': os.path.join(_ROOT, 'QCD', 'gbp_complete_v7_7-2.py'),
+}
+DIFF_COLUMNS = ['name', 'J', 'obs', 'final_a', 'final_b', 'delta', 'err_pct_a', 'err_pct_b',
+                'branch_a', 'branch_b']
+
+def _path(version):
+    return VERSIONS.get(version, version)
+
+def sources(version):
+    """Files whose contents define a version: the script, plus sage core if it imports sage."""
+    path = _path(version)
+    with open(path, encoding='utf-8') as f:
+        uses_sage = re.search(r'^\s*(from|import)\s+sage\b', f.read(), re.M) is not None
+    here = os.path.dirname(os.path.abspath(__file__))
+    return [path] + ([os.path.join(here, n) for n in _SAGE_CORE] if uses_sage else [])
+
+def source_hash(version):
+    h = hashlib.sha256()
+    for p in sources(version):
+        with open(p, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def load(version):
+    """Execute a model script in a fresh, unregistered module namespace (main() is not run)."""
+    path = _path(version)
+    tag = re.sub(r'\W', '_', os.path.splitext(os.path.basename(path))[0])
+    spec = importlib.util.spec_from_file_location(f"_gbp_version_{tag}", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def _clear_sage_caches():
+    """Empty sage.gbp's multiset table and class cache (refilled lazily on use)."""
+    from sage import gbp
+    gbp.MULTISET_TABLE.clear()
+    gbp._CLASS_CACHE.clear()
+
+def evaluate(version, repeat=5):
+    """
+    Run a version over its KNOWN_BARYONS + PREDICTIONS. Returns dict(path,
+    sha256, rows, mape, rmse, timing) with rows as plain (name, J, obs,
+    final, branch) dicts; timing has the first (cold: sage caches emptied
+    first) full evaluation and the best and mean of `repeat` more.
+    """
+    mod = load(version)
+    spec = list(mod.KNOWN_BARYONS) + list(mod.PREDICTIONS)
+    if len(sources(version)) > 1:
+        _clear_sage_caches()
+    t = time.perf_counter()
+    mod.run_rows(spec)
+    cold = time.perf_counter() - t
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = mod.run_rows(spec)
+        times.append(time.perf_counter() - t)
+    rows = [dict(name=r['name'], J=r['J'], obs=r['obs'], final=r['final'], branch=r['branch'])
+            for r in out]
+    obs = [r for r in out if r['obs'] is not None]
+    return dict(path=os.path.relpath(_path(version), _ROOT), sha256=source_hash(version), rows=rows,
+                mape=mod.mape(out), rmse=mod.rmse(obs),
+                timing=dict(cold_s=cold, best_s=min(times), mean_s=sum(times) / len(times), repeat=repeat))
+
+def _read_cache(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def _write_cache(cache, path):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, path)
+
+def cached_evaluate(version, cache_path=None, repeat=5, force=False):
+    """evaluate(), reusing the cached result while the version's source hash is unchanged."""
+    cache = _read_cache(cache_path)
+    key = f"{os.path.relpath(_path(version), _ROOT)}:{source_hash(version)}"
+    if key in cache and not force:
+        return dict(cache[key], cached=True)
+    res = evaluate(version, repeat)
+    if cache_path:
+        cache = {k: v for k, v in cache.items() if not k.startswith(key.rsplit(':', 1)[0] + ':')}
+        cache[key] = res
+        _write_cache(cache, cache_path)
+    return dict(res, cached=False)
+
+def diff(a, b):
+    """Per-baryon delta table (b − a) between two evaluate() results, joined on (name, J)."""
+    ia = {(r['name'], r['J']): r for r in a['rows']}
+    ib = {(r['name'], r['J']): r for r in b['rows']}
+    out = []
+    for key in list(ia) + [k for k in ib if k not in ia]:
+        ra, rb = ia.get(key), ib.get(key)
+        obs = (ra or rb)['obs']
+        fa = ra['final'] if ra else None
+        fb = rb['final'] if rb else None
+        err = lambda f: (f - obs) / obs * 100 if f is not None and obs is not None else None
+        out.append(dict(name=key[0], J=key[1], obs=obs, final_a=fa, final_b=fb,
+                        delta=fb - fa if ra and rb else None, err_pct_a=err(fa), err_pct_b=err(fb),
+                        branch_a=ra and ra['branch'], branch_b=rb and rb['branch']))
+    return out
+
+def compare(a='v7.6', b='v7.7-2', cache_path=None, repeat=5, force=False):
+    """Evaluate (or fetch from cache) both versions and return (res_a, res_b, delta rows)."""
+    ra = cached_evaluate(a, cache_path, repeat, force)
+    rb = cached_evaluate(b, cache_path, repeat, force)
+    return ra, rb, diff(ra, rb)
+
+def changed(rows, tol=1e-9):
+    """Rows whose prediction moved by more than tol MeV (or exist in only one version)."""
+    return [r for r in rows if r['delta'] is None or math.fabs(r['delta']) > tol]